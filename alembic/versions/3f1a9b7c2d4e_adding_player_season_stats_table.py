@@ -0,0 +1,59 @@
+"""Adding player season stats table
+
+Revision ID: 3f1a9b7c2d4e
+Revises: c7fd90001879
+Create Date: 2026-10-18 10:12:41.503112
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1a9b7c2d4e"
+down_revision: Union[str, Sequence[str], None] = "c7fd90001879"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "playerseasonstats",
+        sa.Column("player_id", sa.Integer(), nullable=False),
+        sa.Column("season_id", sa.Integer(), nullable=False),
+        sa.Column("mode", sa.Integer(), nullable=False),
+        sa.Column("wins", sa.Integer(), nullable=False),
+        sa.Column("games", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["player_id"],
+            ["player.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["season_id"],
+            ["season.id"],
+        ),
+        sa.PrimaryKeyConstraint("player_id", "season_id", "mode"),
+    )
+    op.create_index(op.f("ix_playerseasonstats_season_id"), "playerseasonstats", ["season_id"], unique=False)
+
+    # Backfill from the finished matches; `python -m bot.backfill_stats` does the same at any time.
+    op.execute("""
+        INSERT INTO playerseasonstats (player_id, season_id, mode, wins, games)
+        SELECT playerteam.player_id, "match".season_id, "match".mode,
+               SUM(CASE WHEN team.side = "match".result THEN 1 ELSE 0 END), COUNT("match".id)
+        FROM playerteam
+        JOIN team ON playerteam.team_id = team.id
+        JOIN "match" ON team.match_id = "match".id
+        WHERE "match".result IS NOT NULL AND "match".season_id IS NOT NULL
+        GROUP BY playerteam.player_id, "match".season_id, "match".mode
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_playerseasonstats_season_id"), table_name="playerseasonstats")
+    op.drop_table("playerseasonstats")
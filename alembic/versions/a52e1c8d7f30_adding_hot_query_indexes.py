@@ -0,0 +1,55 @@
+"""Adding hot query indexes
+
+Revision ID: a52e1c8d7f30
+Revises: 3f1a9b7c2d4e
+Create Date: 2026-10-18 11:03:27.918245
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a52e1c8d7f30"
+down_revision: Union[str, Sequence[str], None] = "3f1a9b7c2d4e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f("ix_match_created_at"), "match", ["created_at"], unique=False)
+    op.create_index(
+        "ix_match_finished_season_id_created_at",
+        "match",
+        ["season_id", "created_at"],
+        unique=False,
+        sqlite_where=sa.text("result IS NOT NULL"),
+        postgresql_where=sa.text("result IS NOT NULL"),
+    )
+    op.create_index(op.f("ix_team_match_id"), "team", ["match_id"], unique=False)
+    op.create_index(op.f("ix_playerteam_team_id"), "playerteam", ["team_id"], unique=False)
+    op.create_index(op.f("ix_season_start_date"), "season", ["start_date"], unique=False)
+
+    op.drop_index(op.f("ix_playerseasonstats_season_id"), table_name="playerseasonstats")
+    op.create_index("ix_playerseasonstats_season_id_mode", "playerseasonstats", ["season_id", "mode"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_playerseasonstats_season_id_mode", table_name="playerseasonstats")
+    op.create_index(op.f("ix_playerseasonstats_season_id"), "playerseasonstats", ["season_id"], unique=False)
+
+    op.drop_index(op.f("ix_season_start_date"), table_name="season")
+    op.drop_index(op.f("ix_playerteam_team_id"), table_name="playerteam")
+    op.drop_index(op.f("ix_team_match_id"), table_name="team")
+    op.drop_index(
+        "ix_match_finished_season_id_created_at",
+        table_name="match",
+        sqlite_where=sa.text("result IS NOT NULL"),
+        postgresql_where=sa.text("result IS NOT NULL"),
+    )
+    op.drop_index(op.f("ix_match_created_at"), table_name="match")
@@ -0,0 +1,36 @@
+"""Adding data version table
+
+Revision ID: d4b8e2f61a09
+Revises: a52e1c8d7f30
+Create Date: 2026-10-18 14:26:05.117342
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4b8e2f61a09"
+down_revision: Union[str, Sequence[str], None] = "a52e1c8d7f30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "dataversion",
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.execute("INSERT INTO dataversion (name, version) VALUES ('results', 0)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("dataversion")
@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+from sqlmodel import Session
+
+from api.config.config import CACHE_MAX_AGE, CACHE_MAX_ENTRIES, CACHE_VERSION_TTL
+from shared.cache.leaderboard import leaderboard
+from shared.repos import version_repo
+
+
+class ResponseCache:
+    """
+    Serialized responses of the read-only endpoints, kept while the results version in the database stays the same.
+
+    The bot bumps that version in the same transaction as every change to results or points, so a primary key lookup
+    (at most every ``version_ttl`` seconds) tells whether anything cached here, and the leaderboard, is stale.
+    Responses carry the version in their ETag, and a request whose If-None-Match still matches gets an empty 304.
+    """
+
+    def __init__(self, max_entries: int, max_age: int, version_ttl: float):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.version_ttl = version_ttl
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, Tuple[int, bytes]] = OrderedDict()
+        self._version: Optional[int] = None
+        self._version_read_at = 0.0
+
+    def version(self, session: Session) -> int:
+        with self._lock:
+            now = time.monotonic()
+
+            if self._version is None or now - self._version_read_at >= self.version_ttl:
+                version = version_repo.get_version(session, version_repo.RESULTS)
+
+                if version != self._version:
+                    self._entries.clear()
+                    leaderboard.invalidate()
+                    self._version = version
+
+                self._version_read_at = now
+
+            return self._version
+
+    def headers(self, version: int) -> Dict[str, str]:
+        return {
+            "ETag": f'W/"{version}"',
+            "Cache-Control": f"public, max-age={self.max_age}, must-revalidate",
+        }
+
+    @staticmethod
+    def is_not_modified(request: Request, headers: Dict[str, str]) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if not if_none_match:
+            return False
+
+        etags = {etag.strip().removeprefix("W/") for etag in if_none_match.split(",")}
+        return "*" in etags or headers["ETag"].removeprefix("W/") in etags
+
+    def respond(self, request: Request, session: Session, build: Callable[[], BaseModel]) -> Response:
+        """
+        Response for ``request``: the cached body, else ``build()`` serialized and cached under the path and query
+        parameters, or an empty 304 instead if the client is up to date.
+        """
+        version = self.version(session)
+        headers = self.headers(version)
+
+        key = f"{request.url.path}?{sorted(request.query_params.multi_items())}"
+
+        with self._lock:
+            entry = self._entries.get(key)
+            body = entry[1] if entry and entry[0] == version else None
+            if body is not None:
+                self._entries.move_to_end(key)
+
+        if body is None:
+            # Built before answering a 304, so a resource that doesn't exist still gets the error ``build`` raises.
+            body = build().model_dump_json().encode()
+
+            with self._lock:
+                self._entries[key] = (version, body)
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        if self.is_not_modified(request, headers):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache(CACHE_MAX_ENTRIES, CACHE_MAX_AGE, CACHE_VERSION_TTL)
@@ -4,4 +4,10 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./resources/database.db")
+LEADERBOARD_MAX_AGE = float(os.getenv("LEADERBOARD_MAX_AGE", 30))
+
+# Seconds a poller may reuse a response before revalidating it with If-None-Match.
+CACHE_MAX_AGE = int(os.getenv("CACHE_MAX_AGE", 0))
+# Seconds the data version read from the database is trusted before it is read again.
+CACHE_VERSION_TTL = float(os.getenv("CACHE_VERSION_TTL", 1))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
@@ -0,0 +1,48 @@
+from typing import Dict, List
+
+from sqlmodel import Session
+
+from api.schemas import MatchPlayerPublic, MatchPublic, TeamPublic
+from shared.model.database import Match
+from shared.repos import elo_repo, match_repo, player_champion_repo
+
+
+def load_matches(session: Session, matches: List[Match]) -> List[MatchPublic]:
+    """
+    Build a page of matches with their teams, players, champions and elo changes.
+
+    Lineups, champions and elo changes are each fetched once for the whole page with an ``IN`` over its match ids,
+    so the loader runs three queries whatever the page size, instead of lazy loads per match, team and player.
+    With the player lookup and the page query of ``/v1/player/{id}/matches``, a page costs five.
+    """
+    match_ids = [match.id for match in matches]
+
+    champions = player_champion_repo.get_champions_by_matches(session, match_ids)
+    elo_changes = elo_repo.get_active_changes_by_matches(session, match_ids)
+
+    teams: Dict[int, Dict[int, TeamPublic]] = {match_id: {} for match_id in match_ids}
+    for row in match_repo.get_lineups(session, match_ids):
+        team = teams[row.match_id].setdefault(
+            row.team_id, TeamPublic(side=row.side, team_rating=row.team_rating, players=[])
+        )
+        team.players.append(
+            MatchPlayerPublic(
+                id=row.player_id,
+                username=row.username,
+                discord_id=row.discord_id,
+                champion_id=champions.get((row.match_id, row.player_id)),
+                elo_change=elo_changes.get((row.match_id, row.player_id)),
+            )
+        )
+
+    return [
+        MatchPublic(
+            id=match.id,
+            created_at=match.created_at,
+            mode=match.mode,
+            season_id=match.season_id,
+            result=match.result,
+            teams=list(teams[match.id].values()),
+        )
+        for match in matches
+    ]
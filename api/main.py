@@ -1,7 +1,15 @@
 from fastapi import FastAPI
 
-from api.routers import player
+from api.config.config import CACHE_VERSION_TTL, LEADERBOARD_MAX_AGE
+from api.routers import player, season
+from shared.cache.leaderboard import leaderboard
+
+# The bot is the one writing matches, so this process only sees them by reloading: right away when the results
+# version changes, and every LEADERBOARD_MAX_AGE seconds for anything else.
+leaderboard.max_age = LEADERBOARD_MAX_AGE
+leaderboard.version_ttl = CACHE_VERSION_TTL
 
 app = FastAPI()
 
 app.include_router(player.router)
+app.include_router(season.router)
@@ -1,22 +1,137 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Iterator, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 
+from api.cache import response_cache
 from api.config.database import get_session
-from api.schemas import PaginatedRanking
-from shared.repos import player_repo
+from api.loaders import load_matches
+from api.schemas import PaginatedMatches, PaginatedRanking, PlayerPublic, PlayerStats, SeasonModeStats
+from shared.cache.leaderboard import leaderboard
+from shared.model.database import Player
+from shared.repos import match_repo, player_repo, stat_repo
 
 router = APIRouter(prefix="/v1/player", tags=["players"])
 
+EXPORT_BATCH_SIZE = 500
+
+
+def _encode_cursor(player: Player) -> str:
+    return f"{player.points}:{player.id}"
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        points, player_id = cursor.split(":")
+        return int(points), int(player_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido.")
+
 
 @router.get("/ranking", response_model=PaginatedRanking, status_code=status.HTTP_200_OK)
 def ranking_users(
+    request: Request,
     session: Session = Depends(get_session),
     limit: int = Query(default=10, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None, description="next_cursor da página anterior; substitui o offset"),
+    include_total: bool = Query(default=True),
+):
+    """
+    Ranking of the current season: players with at least one finished match in it, by points. Players who only
+    played in earlier seasons are left out; their final elo is in /v1/seasons/{season_id}/final-elo.
+    """
+
+    def build():
+        if cursor:
+            ranked_players = leaderboard.top_after(session, limit, _decode_cursor(cursor))
+        else:
+            ranked_players = leaderboard.top(session, limit, offset)
+
+        if not ranked_players:
+            raise HTTPException(status_code=204, detail="Ainda não há jogadores no ranking.")
+
+        return PaginatedRanking(
+            total=leaderboard.count(session) if include_total else None,
+            limit=limit,
+            offset=0 if cursor else offset,
+            next_cursor=_encode_cursor(ranked_players[-1]) if len(ranked_players) == limit else None,
+            items=ranked_players,
+        )
+
+    return response_cache.respond(request, session, build)
+
+
+def _ndjson(players: List[Player]) -> Iterator[str]:
+    for start in range(0, len(players), EXPORT_BATCH_SIZE):
+        yield "".join(
+            PlayerPublic.model_validate(player).model_dump_json() + "\n"
+            for player in players[start : start + EXPORT_BATCH_SIZE]
+        )
+
+
+@router.get("/ranking/export", status_code=status.HTTP_200_OK)
+def export_ranking(request: Request, session: Session = Depends(get_session)):
+    """
+    The whole ranking of the current season as NDJSON, one player per line from first to last, streamed from a
+    single snapshot.
+    """
+    headers = response_cache.headers(response_cache.version(session))
+    if response_cache.is_not_modified(request, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return StreamingResponse(_ndjson(leaderboard.all(session)), media_type="application/x-ndjson", headers=headers)
+
+
+def _get_player(session: Session, player_id: int) -> Player:
+    player = player_repo.get_player_by_id(session, player_id)
+    if not player:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Jogador não encontrado.")
+    return player
+
+
+@router.get("/{player_id}/stats", response_model=PlayerStats, status_code=status.HTTP_200_OK)
+def player_stats(
+    request: Request,
+    player_id: int,
+    session: Session = Depends(get_session),
+    mode: int = Query(default=0, ge=0, le=5, description="0 para todos os modos"),
+    season: int = Query(default=0, ge=0, description="0 para todas as seasons"),
+):
+    def build():
+        player = _get_player(session, player_id)
+        stats = stat_repo.get_players_stat(session, mode, season, [player_id]).get(player_id)
+
+        return PlayerStats(
+            player=player,
+            rank=leaderboard.rank(session, player_id),
+            wins=stats["wins"] if stats else 0,
+            losses=stats["losses"] if stats else 0,
+            games=stats["games"] if stats else 0,
+            winrate=stats["winrate"] if stats else 0,
+            seasons=[SeasonModeStats.model_validate(row) for row in stat_repo.get_stats_by_player(session, player_id)],
+        )
+
+    return response_cache.respond(request, session, build)
+
+
+@router.get("/{player_id}/matches", response_model=PaginatedMatches, status_code=status.HTTP_200_OK)
+def player_matches(
+    request: Request,
+    player_id: int,
+    session: Session = Depends(get_session),
+    limit: int = Query(default=10, ge=1, le=50),
+    cursor: Optional[int] = Query(default=None, description="next_cursor da página anterior"),
 ):
-    ranked_players, total_players = player_repo.get_all_players_ranked_paginated(session, limit, offset)
+    def build():
+        _get_player(session, player_id)
+        matches = match_repo.get_finished_page_by_player(session, player_id, limit, cursor)
 
-    if not ranked_players:
-        raise HTTPException(status_code=204, detail="Ainda não há jogadores no ranking.")
+        return PaginatedMatches(
+            limit=limit,
+            next_cursor=str(matches[-1].id) if len(matches) == limit else None,
+            items=load_matches(session, matches),
+        )
 
-    return PaginatedRanking(total=total_players, limit=limit, offset=offset, items=ranked_players)
+    return response_cache.respond(request, session, build)
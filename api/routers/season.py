@@ -0,0 +1,38 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import RootModel
+from sqlmodel import Session
+
+from api.cache import response_cache
+from api.config.database import get_session
+from api.schemas import SeasonFinalElo, SeasonPublic
+from shared.repos import elo_repo, season_repo
+
+router = APIRouter(prefix="/v1/seasons", tags=["seasons"])
+
+
+@router.get("", response_model=List[SeasonPublic], status_code=status.HTTP_200_OK)
+def seasons(request: Request, session: Session = Depends(get_session)):
+    def build():
+        return RootModel[List[SeasonPublic]](
+            [SeasonPublic.model_validate(season) for season in season_repo.get_all_seasons(session)]
+        )
+
+    return response_cache.respond(request, session, build)
+
+
+@router.get("/{season_id}/final-elo", response_model=List[SeasonFinalElo], status_code=status.HTTP_200_OK)
+def season_final_elo(request: Request, season_id: int, session: Session = Depends(get_session)):
+    def build():
+        if not season_repo.get_by_id(session, season_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Season não encontrada.")
+
+        return RootModel[List[SeasonFinalElo]](
+            [
+                SeasonFinalElo(rank=rank, points=final_elo.points, player=player)
+                for rank, (final_elo, player) in enumerate(elo_repo.get_season_final_elos(session, season_id), start=1)
+            ]
+        )
+
+    return response_cache.respond(request, session, build)
@@ -1,7 +1,10 @@
+from datetime import datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict
 
+from shared.model.database import TeamSide
+
 
 class PlayerPublic(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -14,7 +17,70 @@ class PlayerPublic(BaseModel):
 
 
 class PaginatedRanking(BaseModel):
-    total: int
+    total: Optional[int]
     limit: int
     offset: int
+    next_cursor: Optional[str]
     items: List[PlayerPublic]
+
+
+class SeasonModeStats(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    season_id: int
+    mode: int
+    wins: int
+    games: int
+
+
+class PlayerStats(BaseModel):
+    player: PlayerPublic
+    rank: Optional[int]
+    wins: int
+    losses: int
+    games: int
+    winrate: float
+    seasons: List[SeasonModeStats]
+
+
+class MatchPlayerPublic(BaseModel):
+    id: int
+    username: str
+    discord_id: Optional[str]
+    champion_id: Optional[str]
+    elo_change: Optional[int]
+
+
+class TeamPublic(BaseModel):
+    side: TeamSide
+    team_rating: float
+    players: List[MatchPlayerPublic]
+
+
+class MatchPublic(BaseModel):
+    id: int
+    created_at: datetime
+    mode: int
+    season_id: Optional[int]
+    result: Optional[TeamSide]
+    teams: List[TeamPublic]
+
+
+class PaginatedMatches(BaseModel):
+    limit: int
+    next_cursor: Optional[str]
+    items: List[MatchPublic]
+
+
+class SeasonPublic(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    start_date: datetime
+    end_date: Optional[datetime]
+
+
+class SeasonFinalElo(BaseModel):
+    rank: int
+    points: int
+    player: PlayerPublic
@@ -0,0 +1,90 @@
+"""
+Measures the p50/p99 latency and the queries per request of the read-only API endpoints on a seeded SQLite database.
+
+Every endpoint is called for a few players with the response cache disabled (each request hits the database) and
+enabled (what pollers see between matches). Needs httpx for FastAPI's test client.
+
+Usage: python -m benchmarks.api_latency
+"""
+
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, create_engine
+
+from api.cache import response_cache
+from api.config.database import get_session
+from api.main import app
+from benchmarks.seed import seed_database
+from bot.service.config_service import ConfigService
+
+NUM_PLAYERS = 200
+NUM_MATCHES = 2000
+REQUESTS = 200
+POLLED_PLAYERS = 20
+
+ENDPOINTS = {
+    "/v1/player/ranking": lambda: {"limit": 50},
+    "/v1/player/{id}/stats": lambda: {},
+    "/v1/player/{id}/matches": lambda: {"limit": 50},
+    "/v1/seasons": lambda: {},
+    "/v1/seasons/{season}/final-elo": lambda: {},
+}
+
+
+def _measure(client, path, params, statements):
+    latencies, queries = [], []
+
+    for _ in range(REQUESTS):
+        url = path.format(id=random.randint(1, POLLED_PLAYERS), season=1)
+
+        statements.clear()
+        start = time.perf_counter()
+        response = client.get(url, params=params())
+        latencies.append(time.perf_counter() - start)
+        queries.append(len(statements))
+
+        assert response.status_code == 200, (url, response.status_code)
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return quantiles[49] * 1000, quantiles[98] * 1000, max(queries)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'benchmark.db')}")
+        seed_database(engine, NUM_PLAYERS, NUM_MATCHES)
+
+        # Close the first season so it has final elos, and leave a few matches in the new one.
+        with Session(engine) as session:
+            ConfigService().reset_elo(session)
+        seed_database(engine, NUM_PLAYERS, 50, seed=7)
+
+        def get_benchmark_session():
+            with Session(engine) as session:
+                yield session
+
+        app.dependency_overrides[get_session] = get_benchmark_session
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        client = TestClient(app)
+        print(f"{'endpoint':<32} | {'cache':<5} | {'p50 (ms)':>8} | {'p99 (ms)':>8} | {'max queries':>11}")
+
+        for path, params in ENDPOINTS.items():
+            for cached in (False, True):
+                response_cache.max_entries = 1024 if cached else 0
+                p50, p99, queries = _measure(client, path, params, statements)
+                print(f"{path:<32} | {str(cached):<5} | {p50:>8.2f} | {p99:>8.2f} | {queries:>11}")
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Compares slash-command style database work done with a blocking session on the event loop against the async session.
+
+Interactions arrive every few milliseconds. Each one acknowledges (the ``defer``) as soon as the loop lets it run,
+then loads a player's last matches (like /historico) and the stats of every player (like /rank). A heartbeat task
+measures how long the loop stays blocked.
+
+The last matches are loaded two ways: with the single projection query /historico runs now, and with the lazy
+loads of teams and players per match it ran before, a deliberately heavy query that shows what the async session
+saves when one interaction holds the database for longer.
+
+Usage: python -m benchmarks.async_db
+"""
+
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, and_, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from benchmarks.seed import seed_database
+from shared.model.database import Match, PlayerTeam, Team
+from shared.repos import match_repo, player_repo, stat_repo
+
+CONCURRENCY = (1, 10, 50, 100)
+ARRIVAL_INTERVAL = 0.005
+ACK_DEADLINE = 3.0
+NUM_PLAYERS = 20
+NUM_MATCHES = 2000
+
+
+def _history(session, discord_id: str):
+    player = player_repo.get_player_by_discord(session, discord_id)
+    return match_repo.get_history_by_player(session, player.id, 50), stat_repo.get_players_stat(session)
+
+
+def _lazy_history(session, discord_id: str):
+    player = player_repo.get_player_by_discord(session, discord_id)
+    matches = session.exec(
+        select(Match)
+        .join(Team)
+        .join(PlayerTeam)
+        .where(and_(PlayerTeam.player_id == player.id, Match.result.is_not(None)))
+        .order_by(Match.created_at.desc())
+        .limit(50)
+    ).all()
+
+    # What the old history embed did: one query for the teams of every match and one for the players of every team.
+    sides = [team.side for match in matches for team in match.teams if player in team.players]
+    return sides, stat_repo.get_players_stat(session)
+
+
+WORKLOADS = {"projection": _history, "lazy load": _lazy_history}
+
+
+async def _interaction(idx, start, run, acks):
+    arrival = start + idx * ARRIVAL_INTERVAL
+    await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+
+    acks.append(time.perf_counter() - arrival)
+    await run(str(1000 + idx % NUM_PLAYERS))
+
+
+async def _heartbeat(stalls, stop):
+    while not stop.is_set():
+        before = time.perf_counter()
+        await asyncio.sleep(0.01)
+        stalls.append(time.perf_counter() - before - 0.01)
+
+
+async def _measure(run, concurrency):
+    acks, stalls = [], []
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(stalls, stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_interaction(idx, start, run, acks) for idx in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await heartbeat
+
+    return {
+        "elapsed": elapsed,
+        "ack_p99": statistics.quantiles(acks, n=100)[98] if len(acks) > 1 else acks[0],
+        "ack_max": max(acks),
+        "in_time": sum(ack <= ACK_DEADLINE for ack in acks),
+        "stall_max": max(stalls, default=0.0),
+    }
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmark.db")
+        engine = create_engine(f"sqlite:///{path}")
+        seed_database(engine, NUM_PLAYERS, NUM_MATCHES)
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+        def blocking(workload):
+            async def run(discord_id):
+                with Session(engine) as session:
+                    workload(session, discord_id)
+
+            return run
+
+        def non_blocking(workload):
+            async def run(discord_id):
+                async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                    await session.run_sync(workload, discord_id)
+
+            return run
+
+        print(
+            f"{'workload':<10} | {'interactions':>12} | {'session':<8} | {'total (s)':>9} | {'ack p99 (ms)':>12} | "
+            f"{'ack max (ms)':>12} | {'acked < 3s':>10} | {'loop stall max (ms)':>19}"
+        )
+
+        for workload_name, workload in WORKLOADS.items():
+            for concurrency in CONCURRENCY:
+                for name, run in (("sync", blocking(workload)), ("async", non_blocking(workload))):
+                    result = await _measure(run, concurrency)
+                    print(
+                        f"{workload_name:<10} | {concurrency:>12} | {name:<8} | {result['elapsed']:>9.2f} | "
+                        f"{result['ack_p99'] * 1000:>12.1f} | {result['ack_max'] * 1000:>12.1f} | "
+                        f"{result['in_time']:>10} | {result['stall_max'] * 1000:>19.1f}"
+                    )
+
+        await async_engine.dispose()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
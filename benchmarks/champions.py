@@ -0,0 +1,80 @@
+"""
+Synthetic champion images and a local stand-in for Data Dragon, for the champion benchmarks.
+"""
+
+import asyncio
+import hashlib
+import io
+import random
+from contextlib import asynccontextmanager
+from typing import Dict
+
+from aiohttp import web
+from PIL import Image
+
+IMAGE_SIZE = 120
+
+
+def make_champion_images(count: int = 170, seed: int = 42) -> Dict[str, bytes]:
+    """
+    PNGs shaped like the Data Dragon squares: 120x120, a gradient with some noise, so they compress like portraits.
+    """
+    rng = random.Random(seed)
+    images = {}
+
+    for idx in range(count):
+        base = [rng.randrange(256) for _ in range(3)]
+        image = Image.linear_gradient("L").resize((IMAGE_SIZE, IMAGE_SIZE)).convert("RGB")
+        image = Image.blend(image, Image.new("RGB", image.size, tuple(base)), 0.6)
+        noise = Image.effect_noise(image.size, 40).convert("RGB")
+        image = Image.blend(image, noise, 0.2)
+
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        images[str(idx + 1)] = buffer.getvalue()
+
+    return images
+
+
+@asynccontextmanager
+async def fake_data_dragon(images: Dict[str, bytes], version: str = "1.0.1", latency: float = 0.05, port: int = 8765):
+    """
+    Serve ``images`` the way Data Dragon does, answering every request after ``latency`` seconds. Yields the base URL.
+    """
+
+    async def versions(request):
+        await asyncio.sleep(latency)
+        return web.json_response([version])
+
+    async def champion_list(request):
+        await asyncio.sleep(latency)
+        return web.json_response(
+            {
+                "data": {
+                    f"Champion{key}": {"id": f"Champion{key}", "key": key, "name": f"Champion {key}"} for key in images
+                }
+            }
+        )
+
+    async def champion_image(request):
+        await asyncio.sleep(latency)
+        body = images[request.match_info["name"].removeprefix("Champion").removesuffix(".png")]
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, content_type="image/png", headers={"ETag": etag})
+
+    app = web.Application()
+    app.router.add_get("/api/versions.json", versions)
+    app.router.add_get("/cdn/{version}/data/pt_BR/champion.json", champion_list)
+    app.router.add_get("/cdn/{version}/img/champion/{name}", champion_image)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,159 @@
+"""
+Runs every repo query against a seeded SQLite database and checks its EXPLAIN QUERY PLAN for full table scans.
+
+Usage: python -m benchmarks.query_plans
+Exits with status 1 if a query scans a table it is not allowed to. CI runs the same check through
+tests/test_query_plans.py.
+"""
+
+import re
+import sys
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, create_engine
+
+from benchmarks.seed import seed_database
+from shared.repos import (
+    config_repo,
+    elo_repo,
+    match_repo,
+    player_champion_repo,
+    player_repo,
+    season_repo,
+    stat_repo,
+)
+
+# A "SCAN <table>" without an index is a full table scan. Scans that walk an index in order (ORDER BY ... LIMIT)
+# show up as "SCAN <table> USING [COVERING] INDEX" and are fine.
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+QUERIES = {
+    "config_repo.get_pool_players": (lambda s: config_repo.get_pool_players(s), {"activeplayer"}),
+    "elo_repo.get_active_history_by_matches": (lambda s: elo_repo.get_active_history_by_matches(s, [1, 2]), set()),
+    "elo_repo.get_active_changes_by_matches": (
+        lambda s: elo_repo.get_active_changes_by_matches(s, [1, 2]),
+        set(),
+    ),
+    "elo_repo.get_active_history_from": (
+        lambda s: elo_repo.get_active_history_from(s, 1, datetime(2000, 1, 1)),
+        set(),
+    ),
+    "match_repo.get_by_id": (lambda s: match_repo.get_by_id(s, 1), set()),
+    "match_repo.get_history_by_player": (lambda s: match_repo.get_history_by_player(s, 1, 50), set()),
+    "match_repo.get_finished_page_by_player": (
+        lambda s: match_repo.get_finished_page_by_player(s, 1, 10, 5),
+        set(),
+    ),
+    "match_repo.get_lineups": (lambda s: match_repo.get_lineups(s, [1, 2]), set()),
+    "match_repo.get_recent_teammate_counts": (
+        lambda s: match_repo.get_recent_teammate_counts(s, [1, 2, 3], 10),
+        set(),
+    ),
+    "match_repo.get_finished_in_range": (lambda s: match_repo.get_finished_in_range(s, 1, 5), set()),
+    "match_repo.stream_finished_from": (
+        lambda s: list(match_repo.stream_finished_from(s, 1, datetime(2000, 1, 1))),
+        set(),
+    ),
+    "player_champion_repo.get_champion_pool_sizes": (
+        lambda s: player_champion_repo.get_champion_pool_sizes(s, [1, 2]),
+        set(),
+    ),
+    "player_champion_repo.get_champions_by_matches": (
+        lambda s: player_champion_repo.get_champions_by_matches(s, [1, 2]),
+        set(),
+    ),
+    "player_champion_repo.get_recent_champions": (
+        lambda s: player_champion_repo.get_recent_champions(s, [1, 2], 5),
+        # The window subquery only holds the requested players' matches, and each one is read once.
+        {"recent"},
+    ),
+    "player_repo.get_player_by_discord": (lambda s: player_repo.get_player_by_discord(s, "1000"), set()),
+    "player_repo.get_player_by_id": (lambda s: player_repo.get_player_by_id(s, 1), set()),
+    "player_repo.get_players_by_ids": (lambda s: player_repo.get_players_by_ids(s, [1, 2]), set()),
+    "player_repo.get_players_by_discord_ids": (
+        lambda s: player_repo.get_players_by_discord_ids(s, ["1000", "1001"]),
+        set(),
+    ),
+    # The query Leaderboard.load ranks the season with.
+    "player_repo.get_all_players_ranked_with_games": (
+        lambda s: player_repo.get_all_players_ranked_with_games(s),
+        set(),
+    ),
+    "player_repo.get_all_players_by_match": (lambda s: player_repo.get_all_players_by_match(s, 1), set()),
+    "season_repo.get_last_season": (lambda s: season_repo.get_last_season(s), set()),
+    "season_repo.get_by_id": (lambda s: season_repo.get_by_id(s, 1), set()),
+    "stat_repo.get_players_stat (season)": (lambda s: stat_repo.get_players_stat(s, 0, 1), set()),
+    "stat_repo.get_players_stat (season, mode)": (lambda s: stat_repo.get_players_stat(s, 5, 1), set()),
+    "stat_repo.get_players_stat (player)": (lambda s: stat_repo.get_players_stat(s, 0, 0, [1]), set()),
+    "stat_repo.season_players_query": (lambda s: s.exec(stat_repo.season_players_query(1)).all(), set()),
+    "stat_repo.get_stats_by_player": (lambda s: stat_repo.get_stats_by_player(s, 1), set()),
+    "elo_repo.get_season_final_elos": (lambda s: elo_repo.get_season_final_elos(s, 1), set()),
+    "season_repo.get_all_seasons": (lambda s: season_repo.get_all_seasons(s), set()),
+    "stat_repo.add_match_stats": (lambda s: stat_repo.add_match_stats(s, [1]), set()),
+}
+
+
+def capture_selects(engine) -> list:
+    """
+    The SELECT statements run on ``engine`` from now on, with their parameters, in the returned list.
+    """
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            statements.append((statement, parameters))
+
+    return statements
+
+
+def full_scans(engine, statements: list, query, allowed_scans: set) -> set:
+    """
+    Run ``query`` in a session that is rolled back and return the tables its statements fully scan.
+    """
+    statements.clear()
+    with Session(engine) as session:
+        query(session)
+        session.rollback()
+
+    scans = set()
+    with engine.connect() as connection:
+        for statement, parameters in list(statements):
+            for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+                match = FULL_SCAN.match(row[3])
+                if match and match.group(1) not in allowed_scans:
+                    scans.add(match.group(1))
+
+    return scans
+
+
+def seeded_engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    seed_database(engine)
+    return engine
+
+
+def main():
+    engine = seeded_engine()
+    statements = capture_selects(engine)
+
+    failures = 0
+
+    for name, (query, allowed_scans) in QUERIES.items():
+        scans = full_scans(engine, statements, query, allowed_scans)
+
+        if scans:
+            failures += 1
+            print(f"FAIL {name}: full scan on {', '.join(sorted(scans))}")
+        else:
+            print(f"ok   {name}")
+
+    if failures:
+        print(f"{failures} queries with full table scans.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
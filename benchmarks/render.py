@@ -0,0 +1,98 @@
+"""
+Measures how long composing a 10 champion team image takes, decoding every PNG per call (the old
+create_image_from_champions) against copying tiles out of the champion atlas, and checks both give the same pixels.
+Encoding is timed apart, since it is the same for both.
+
+Then renders and encodes the same drafts with every encoder option, reporting time and size per image, and the
+time of a draft already in the render cache.
+
+Usage: python -m benchmarks.render
+"""
+
+import io
+import random
+import statistics
+import time
+
+from PIL import Image, ImageChops, ImageDraw
+
+from benchmarks.champions import make_champion_images
+from bot.utils.champion_image import TILE_BYTES, ChampionAtlas, ImageEncoder, TeamImageRenderer, compose_champions
+
+RENDERS = 200
+TEAM_SIZE = 10
+
+ENCODERS = {
+    "png, level 6": ImageEncoder("png", png_compress_level=6),
+    "png, level 1": ImageEncoder("png", png_compress_level=1),
+    "png, level 0": ImageEncoder("png", png_compress_level=0),
+    "webp lossless": ImageEncoder("webp"),
+    "jpeg, quality 90": ImageEncoder("jpeg", jpeg_quality=90),
+}
+
+
+def compose_decoding(champions_list, data):
+    new_im = Image.new("RGBA", (680, 281), (255, 0, 0, 0))
+    new_im_draw = ImageDraw.Draw(new_im)
+
+    x_offset, y_offset = 10, 10
+    for idx, _id in enumerate(champions_list):
+        new_im.paste(Image.open(io.BytesIO(data[_id]["image"])), (x_offset, y_offset))
+        new_im_draw.text(
+            (x_offset + 5, y_offset), str(idx + 1), font_size=30, fill="white", stroke_width=2, stroke_fill="black"
+        )
+
+        x_offset += 133
+        if x_offset >= 670:
+            x_offset, y_offset = 10, y_offset + 133
+
+    return new_im
+
+
+def _measure(render, drafts):
+    timings = []
+    for draft in drafts:
+        start = time.perf_counter()
+        render(draft)
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings) * 1000, max(timings) * 1000
+
+
+def main():
+    data = {_id: {"image": image} for _id, image in make_champion_images().items()}
+    drafts = [random.sample(list(data), TEAM_SIZE) for _ in range(RENDERS)]
+
+    atlas = ChampionAtlas(data, 16 * 1024 * 1024)
+    capped = ChampionAtlas(data, 40 * TILE_BYTES)
+
+    expected = compose_decoding(drafts[0], data)
+    for candidate in (atlas, capped):
+        assert not ImageChops.difference(expected, compose_champions(drafts[0], candidate)).getbbox()
+
+    print(f"{'render':<20} | {'p50 (ms)':>8} | {'max (ms)':>8}")
+    for name, render in (
+        ("decode per call", lambda draft: compose_decoding(draft, data)),
+        ("atlas", lambda draft: compose_champions(draft, atlas)),
+        ("atlas, 40 tiles", lambda draft: compose_champions(draft, capped)),
+        ("png encode", lambda draft: expected.save(io.BytesIO(), format="PNG")),
+    ):
+        p50, worst = _measure(render, drafts)
+        print(f"{name:<20} | {p50:>8.2f} | {worst:>8.2f}")
+
+    print()
+    print(f"{'encoder':<20} | {'p50 (ms)':>8} | {'max (ms)':>8} | {'size (KB)':>9} | {'cached (ms)':>11}")
+    for name, encoder in ENCODERS.items():
+        renderer = TeamImageRenderer(encoder, cache_size=len(drafts))
+        sizes = []
+
+        p50, worst = _measure(lambda draft: sizes.append(len(renderer.render(draft, atlas))), drafts)
+        cached, _ = _measure(lambda draft: renderer.render(draft, atlas), drafts)
+        print(f"{name:<20} | {p50:>8.2f} | {worst:>8.2f} | {statistics.median(sizes) / 1024:>9.1f} | {cached:>11.4f}")
+
+    print()
+    print(f"atlas memory: {atlas.capacity * TILE_BYTES / 1024 / 1024:.1f}MB for {len(atlas)} champions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Measures what rendering the two team images of a match costs the event loop, inline (the old /sortear) against
+the image render service.
+
+A ticker on the loop records how late it wakes up while matches are rendered: that lateness is how long every
+other interaction is frozen. The render cache is disabled so every match is actually rendered. The time per match
+only drops with the pool when there is more than one core to run both teams on.
+
+Usage: python -m benchmarks.render_pool
+"""
+
+import asyncio
+import random
+import time
+
+from benchmarks.champions import make_champion_images
+from bot.service.image_service import ImageRenderService
+from bot.utils.champion_image import ChampionAtlas, ImageEncoder, TeamImageRenderer
+
+MATCHES = 30
+TICK = 0.001
+
+
+async def _ticker(stalls: list, stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        stalls.append(time.perf_counter() - start - TICK)
+
+
+async def _run(render_match, drafts):
+    stalls, stop = [], asyncio.Event()
+    ticker = asyncio.create_task(_ticker(stalls, stop))
+    await asyncio.sleep(TICK)
+
+    start = time.perf_counter()
+    for blue, red in drafts:
+        await render_match(blue, red)
+        # Other interactions get the loop between matches, as they would between commands.
+        await asyncio.sleep(TICK)
+    elapsed = (time.perf_counter() - start) / len(drafts) - TICK
+
+    stop.set()
+    await ticker
+    return elapsed * 1000, max(stalls) * 1000
+
+
+async def main():
+    data = {_id: {"image": image} for _id, image in make_champion_images().items()}
+    atlas = ChampionAtlas(data, 16 * 1024 * 1024, "1.0.1")
+    drafts = [(random.sample(list(data), 5), random.sample(list(data), 5)) for _ in range(MATCHES)]
+
+    print(f"{'encoder':<14} | {'render':<8} | {'per match (ms)':>14} | {'worst loop stall (ms)':>21}")
+
+    for name, encoder in (("png, level 6", ImageEncoder("png", 6)), ("png, level 1", ImageEncoder("png", 1))):
+        renderer = TeamImageRenderer(encoder, cache_size=0)
+        service = ImageRenderService(renderer, workers=2)
+
+        async def inline(blue, red):
+            renderer.render(blue, atlas)
+            renderer.render(red, atlas)
+
+        async def pooled(blue, red):
+            await service.render_teams([blue, red], atlas)
+
+        for mode, render_match in (("inline", inline), ("pool", pooled)):
+            per_match, stall = await _run(render_match, drafts)
+            print(f"{name:<14} | {mode:<8} | {per_match:>14.2f} | {stall:>21.2f}")
+
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
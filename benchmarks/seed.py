@@ -0,0 +1,70 @@
+"""
+Seeds a database with random players and finished matches for the benchmarks.
+"""
+
+import random
+
+from sqlmodel import Session, SQLModel
+
+from shared.model.database import (
+    ActivePlayer,
+    Match,
+    Player,
+    PlayerEloHistory,
+    PlayerMatchChampion,
+    Season,
+    Team,
+    TeamSide,
+)
+from shared.repos import stat_repo
+
+
+def seed_database(engine, num_players: int = 20, num_matches: int = 20, seed: int = 42):
+    random.seed(seed)
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        season = Season()
+        players = [
+            Player(username=f"player{idx}", discord_id=str(1000 + idx), points=random.randint(1300, 1700))
+            for idx in range(num_players)
+        ]
+        session.add(season)
+        session.add_all(players)
+        session.commit()
+
+        for _ in range(num_matches):
+            selected = random.sample(players, 10)
+            result = random.choice([TeamSide.blue, TeamSide.red])
+            match = Match(
+                mode=5,
+                season=season,
+                result=result,
+                teams=[
+                    Team(side=TeamSide.blue, champions=[], team_rating=1500, players=selected[:5]),
+                    Team(side=TeamSide.red, champions=[], team_rating=1500, players=selected[5:]),
+                ],
+            )
+            session.add(match)
+            session.flush()
+
+            for idx, player in enumerate(selected):
+                change = 10 if (idx < 5) == (result == TeamSide.blue) else -10
+                session.add(
+                    PlayerEloHistory(
+                        player_id=player.id,
+                        match_id=match.id,
+                        points_before=player.points - change,
+                        points_after=player.points,
+                        change=change,
+                    )
+                )
+                session.add(
+                    PlayerMatchChampion(player_id=player.id, match_id=match.id, champion_id=str(random.randint(1, 170)))
+                )
+
+        session.add_all(ActivePlayer(player_id=player.id) for player in players[:10])
+        session.commit()
+
+        stat_repo.rebuild_stats(session)
+        session.commit()
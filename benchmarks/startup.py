@@ -0,0 +1,67 @@
+"""
+Measures how long the bot takes to get online and to have its champions, with a cold and a warm champion cache.
+
+Logging in to Discord is left out: "online" is everything the bot does before it can connect to the gateway. Data
+Dragon is a local stand-in answering each request after ``LATENCY`` seconds. "blocking" is the old startup, which
+checked the version (and downloaded on a cold cache) before connecting. "background" is the current one, where
+the check starts once the bot is online.
+
+Usage: python -m benchmarks.startup
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+import aiohttp
+
+from benchmarks.champions import fake_data_dragon, make_champion_images
+from shared.repos import champions_repo
+
+LATENCY = 0.05
+
+
+async def _start(http_session, blocking: bool):
+    start = time.perf_counter()
+
+    champion_data = champions_repo.ImageDict()
+    if blocking:
+        await champion_data.update_data(http_session)
+    online = time.perf_counter() - start
+
+    if not blocking:
+        await champion_data.update_data(http_session)
+    complete = time.perf_counter() - start
+
+    return online, complete, len(champion_data)
+
+
+async def main():
+    images = make_champion_images()
+
+    with tempfile.TemporaryDirectory() as directory:
+        champions_repo.CACHE_DIR = os.path.join(directory, "champions")
+        champions_repo.CACHE_INDEX = os.path.join(champions_repo.CACHE_DIR, "index.json")
+        champions_repo.LEGACY_CACHE_FILE = os.path.join(directory, "champion_cache.json")
+
+        async with fake_data_dragon(images, latency=LATENCY) as base_url, aiohttp.ClientSession() as http_session:
+            champions_repo.BASE_API_URL = base_url
+
+            print(f"{'startup':<10} | {'cache':<5} | {'online (ms)':>11} | {'champions ready (ms)':>20}")
+
+            for blocking in (True, False):
+                for cache in ("cold", "warm"):
+                    if cache == "cold":
+                        shutil.rmtree(champions_repo.CACHE_DIR, ignore_errors=True)
+
+                    online, complete, count = await _start(http_session, blocking)
+                    assert count == len(images)
+
+                    name = "blocking" if blocking else "background"
+                    print(f"{name:<10} | {cache:<5} | {online * 1000:>11.1f} | {complete * 1000:>20.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
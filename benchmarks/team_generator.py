@@ -0,0 +1,81 @@
+"""
+Compares the team split scoring strategies.
+
+Usage: python -m benchmarks.team_generator
+"""
+
+import itertools
+import math
+import random
+import timeit
+
+from bot.team_generator.generator import _exhaustive_matchups, _meet_in_the_middle_matchups
+from shared.model.database import Player
+
+PLAYER_COUNTS = (10, 14, 18)
+POOL_SIZE = 10
+REPEAT = 5
+
+
+def _loop_matchups(players, team_size, pool_size):
+    """
+    The original per-combination loop, kept as the baseline.
+    """
+    all_combinations = list(itertools.combinations(players, team_size))
+
+    num_unique_matches = math.ceil(len(all_combinations) / 2)
+
+    matchups = []
+
+    all_players_set = set(players)
+
+    for i in range(num_unique_matches):
+        team_a = list(all_combinations[i])
+        team_b = list(all_players_set.difference(team_a))
+
+        rating_a = sum(player.points for player in team_a) / team_size
+        rating_b = sum(player.points for player in team_b) / team_size
+
+        matchups.append(
+            {
+                "team_a": team_a,
+                "team_b": team_b,
+                "rating_a": rating_a,
+                "rating_b": rating_b,
+                "elo_difference": abs(rating_a - rating_b),
+            }
+        )
+
+    matchups.sort(key=lambda x: x["elo_difference"])
+
+    return matchups[:pool_size]
+
+
+STRATEGIES = {
+    "loop": _loop_matchups,
+    "numpy": _exhaustive_matchups,
+    "meet-in-the-middle": _meet_in_the_middle_matchups,
+}
+
+
+def main():
+    random.seed(42)
+
+    print(f"{'players':>7} | {'strategy':<18} | {'best (ms)':>9} | best elo difference")
+
+    for num_players in PLAYER_COUNTS:
+        players = [
+            Player(id=idx, username=f"player{idx}", discord_id=str(idx), points=random.randint(1200, 1800))
+            for idx in range(num_players)
+        ]
+        team_size = num_players // 2
+
+        for name, strategy in STRATEGIES.items():
+            best_time = min(timeit.repeat(lambda: strategy(players, team_size, POOL_SIZE), number=1, repeat=REPEAT))
+            best_match = strategy(players, team_size, POOL_SIZE)[0]
+
+            print(f"{num_players:>7} | {name:<18} | {best_time * 1000:>9.2f} | {best_match['elo_difference']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
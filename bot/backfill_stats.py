@@ -0,0 +1,20 @@
+import logging
+
+from shared.repos import stat_repo, version_repo
+from shared.repos.database import session_scope
+
+logging.basicConfig(format="%(levelname)s %(name)s %(asctime)s: %(message)s", level=logging.INFO)
+logger = logging.getLogger("backfill_stats")
+
+
+def main():
+    with session_scope() as session:
+        stat_repo.rebuild_stats(session)
+        # Committed with the rebuild, so the API and the leaderboard reload what it changed.
+        version_repo.bump_version(session, version_repo.RESULTS)
+
+    logger.info("Player season stats rebuilt from finished matches.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
+import asyncio
 import logging
 from datetime import datetime, time
+from typing import Optional
 
 from discord import Activity, ActivityType, Cog
 from discord.commands import ApplicationContext
@@ -7,7 +9,7 @@ from discord.ext import commands, tasks
 
 from bot.main import PorozudoBot
 from bot.service.config_service import ConfigService
-from shared.repos.database import get_session
+from shared.repos.database import async_session_scope
 
 logger = logging.getLogger("c/config")
 
@@ -16,6 +18,7 @@ class ConfigCog(Cog):
     def __init__(self, bot: PorozudoBot):
         self.bot = bot
         self.config_service = ConfigService()
+        self.champion_check: Optional[asyncio.Task] = None
 
         self.daily_champion_update.start()
         self.monthly_season_reset.start()
@@ -31,11 +34,16 @@ class ConfigCog(Cog):
             activity=Activity(type=ActivityType.custom, name="custom", state="Fraudando as runas....")
         )
 
+        # The cached champions are served from startup; checking Data Dragon for a new version waits until the bot is
+        # online, and runs once even if the gateway reconnects.
+        if self.champion_check is None:
+            self.champion_check = asyncio.create_task(self.daily_champion_update())
+
     @tasks.loop(time=time(hour=6, minute=0, second=0))
     async def daily_champion_update(self):
         logger.info("Atualizando dados dos campeões...")
         try:
-            self.bot.champion_data.update_data()
+            await self.bot.update_champion_data()
             logger.info("Dados dos campeões atualizados.")
         except Exception as e:
             logger.error(f"Falha ao atualizar dados dos campeões: {e}")
@@ -44,8 +52,8 @@ class ConfigCog(Cog):
     async def monthly_season_reset(self):
         today = datetime.now().date()
         if today.day == 1:
-            with next(get_session()) as session:
-                self.config_service.reset_elo(session)
+            async with async_session_scope() as session:
+                await session.run_sync(self.config_service.reset_elo)
 
     @commands.slash_command(name="reset", description="Cria uma nova season e reinicia os elos")
     async def reset(self, ctx: ApplicationContext):
@@ -59,8 +67,8 @@ class ConfigCog(Cog):
             await ctx.followup.send("Somente admins podem usar esse comando")
             return
 
-        with next(get_session()) as session:
-            self.config_service.reset_elo(session)
+        async with async_session_scope() as session:
+            await session.run_sync(self.config_service.reset_elo)
             await ctx.followup.send("Nova season iniciada!")
 
 
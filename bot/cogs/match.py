@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 import discord
@@ -5,44 +6,53 @@ from discord import Cog, OptionChoice
 from discord.commands import Option
 from discord.ext import commands
 
+from bot.config import (
+    CHAMPION_HISTORY_MATCHES,
+    DM_CONCURRENCY,
+    TEAM_BALANCE_TIME_BUDGET,
+    TEAM_HISTORY_MATCHES,
+    TEAM_POOL_SIZE,
+)
 from bot.main import PorozudoBot
+from bot.service.dm_dispatcher import DMDispatcher
+from bot.service.elo_replay_service import EloReplayService
 from bot.service.match_monitor import ActiveMatchMonitor
 from bot.service.match_service import MatchService
-from bot.team_generator.generator import generate_teams
+from bot.team_generator.generator import BalanceStrategy, generate_teams
 from bot.ui.views import ResultButtons
 from bot.utils.embed import create_champion_embed
 from shared.model.database import Match, TeamSide
-from shared.repos import config_repo, match_repo, season_repo
-from shared.repos.database import get_session
+from shared.repos import config_repo, match_repo, player_champion_repo, season_repo
+from shared.repos.database import async_session_scope
 
 logger = logging.getLogger("c/match")
 
 
-async def send_embed(player_info, embed, bot):
-    player_discord = await bot.fetch_user(player_info.discord_id)
-
-    try:
-        embed["file"].seek(0)
-        file = discord.File(fp=embed["file"], filename="image.png")
-
-        await player_discord.send(file=file, embed=embed["embed"])
-    except Exception as e:
-        logger.warning(f"Failed to send message to user {player_discord.name}, cause: {e}")
-
-
 class MatchCog(Cog):
     def __init__(self, bot: PorozudoBot):
         self.bot = bot
         self.riot_client = bot.riot_client
 
         self.match_service = MatchService()
+        self.elo_replay_service = EloReplayService()
         self.match_monitor = ActiveMatchMonitor(riot_client=self.riot_client, match_service=self.match_service)
+        self.dm_dispatcher = DMDispatcher(bot, DM_CONCURRENCY)
 
     @commands.slash_command(name="sortear", description="Sortea os times e campeões")
     async def create_match(
         self,
         ctx,
         choices_number: Option(int, "Quantidade de campeões", name="opções", default=0, min_value=1, max_value=10),
+        strategy: Option(
+            BalanceStrategy,
+            "Critério de balanceamento",
+            name="balanceamento",
+            default=BalanceStrategy.exhaustive,
+            choices=[
+                OptionChoice("Elo", value=BalanceStrategy.exhaustive),
+                OptionChoice("Elo + histórico", value=BalanceStrategy.annealing),
+            ],
+        ),
     ):
         await ctx.response.defer()
         if not ctx.guild_id:
@@ -53,37 +63,89 @@ class MatchCog(Cog):
             await ctx.followup.send("Somente admins podem usar esse comando")
             return
 
-        with next(get_session()) as session:
-            players = config_repo.get_pool_players(session)
+        if not self.bot.champion_data:
+            await ctx.followup.send("Os campeões ainda estão sendo baixados, tente novamente em instantes.")
+            return
+
+        async with async_session_scope() as session:
+            players = await session.run_sync(config_repo.get_pool_players)
+
+            player_ids = [player.id for player in players]
+
+            recent_teammates, champion_experience, champion_exclusions = None, None, None
+            if strategy == BalanceStrategy.annealing:
+                recent_teammates = await session.run_sync(
+                    match_repo.get_recent_teammate_counts, player_ids, TEAM_HISTORY_MATCHES
+                )
+                champion_experience = await session.run_sync(player_champion_repo.get_champion_pool_sizes, player_ids)
+
+            if CHAMPION_HISTORY_MATCHES:
+                champion_exclusions = await session.run_sync(
+                    player_champion_repo.get_recent_champions, player_ids, CHAMPION_HISTORY_MATCHES
+                )
 
             try:
-                teams = generate_teams(players, list(self.bot.champion_data.values()), choices_number)
+                # The split search runs for up to the time budget, so it gets a thread instead of the event loop.
+                teams = await asyncio.to_thread(
+                    generate_teams,
+                    players,
+                    self.bot.champion_sampler,
+                    choices_number,
+                    pool_size=TEAM_POOL_SIZE,
+                    strategy=strategy,
+                    time_budget=TEAM_BALANCE_TIME_BUDGET,
+                    recent_teammates=recent_teammates,
+                    champion_experience=champion_experience,
+                    champion_exclusions=champion_exclusions,
+                )
             except ValueError as e:
                 await ctx.followup.send(str(e))
                 return
 
-            season = season_repo.get_last_season(session)
-            match = match_repo.create(session, Match(teams=teams, mode=len(teams[0].players), season=season))
+            season = await session.run_sync(season_repo.get_last_season)
+            match = await session.run_sync(
+                match_repo.create, Match(teams=teams, mode=len(teams[0].players), season=season)
+            )
 
             blue_team_db = teams[0] if teams[0].side == "blue" else teams[1]
             red_team_db = teams[1] if teams[1].side == "red" else teams[0]
 
+            blue_image, red_image = await self.bot.image_service.render_teams(
+                [blue_team_db.champions, red_team_db.champions], self.bot.champion_atlas
+            )
+
             blue_embed = create_champion_embed(
-                blue_team_db.champions, self.bot.champion_data, discord.Colour.blue(), 1, blue_team_db.players
+                blue_team_db.champions,
+                self.bot.champion_data,
+                blue_image,
+                self.bot.image_service.filename,
+                discord.Colour.blue(),
+                1,
+                blue_team_db.players,
             )
             red_embed = create_champion_embed(
-                red_team_db.champions, self.bot.champion_data, discord.Colour.red(), 2, red_team_db.players
+                red_team_db.champions,
+                self.bot.champion_data,
+                red_image,
+                self.bot.image_service.filename,
+                discord.Colour.red(),
+                2,
+                red_team_db.players,
             )
 
             blue_team_players = ""
             for idx, player in enumerate(blue_team_db.players):
                 blue_team_players += f"{idx + 1} - <@{player.discord_id}>\n"
-                await send_embed(player, blue_embed, self.bot)
 
             red_team_players = ""
             for idx, player in enumerate(red_team_db.players):
                 red_team_players += f"{idx + 1} - <@{player.discord_id}>\n"
-                await send_embed(player, red_embed, self.bot)
+
+            dm_task = self.dm_dispatcher.dispatch(
+                ctx.guild,
+                [(player.discord_id, blue_embed) for player in blue_team_db.players]
+                + [(player.discord_id, red_embed) for player in red_team_db.players],
+            )
 
             embed = discord.Embed(
                 title=f"Partidazuda ({match.id})",
@@ -98,6 +160,14 @@ class MatchCog(Cog):
                 embed=embed, view=ResultButtons(match.id, ctx.author.id, match_service=self.match_service)
             )
 
+        failures = await dm_task
+        if failures:
+            await ctx.followup.send(
+                "Não consegui enviar a mensagem privada para "
+                + ", ".join(f"<@{discord_id}>" for discord_id, _ in failures)
+                + ". Verifiquem se as mensagens diretas estão abertas."
+            )
+
     @commands.slash_command(name="finalizar", description="Finaliza uma partida")
     async def finalize(
         self,
@@ -122,14 +192,14 @@ class MatchCog(Cog):
             await ctx.followup.send("Somente admins podem usar esse comando")
             return
 
-        with next(get_session()) as session:
-            match = match_repo.get_by_id(session, match_id)
+        async with async_session_scope() as session:
+            match = await session.run_sync(match_repo.get_by_id, match_id)
 
             if not match or match.result is not None:
                 await ctx.followup.send("Partida já finalizada!")
                 return
 
-            self.match_service.finalize_match(session, match, result)
+            await session.run_sync(self.match_service.finalize_match, match, result)
 
             await ctx.followup.send(
                 f"Partida finalizada! Vitoria para o time {'azul' if result == TeamSide.blue else 'vermelho'}!"
@@ -150,17 +220,103 @@ class MatchCog(Cog):
             await ctx.followup.send("Somente admins podem usar esse comando")
             return
 
-        with next(get_session()) as session:
-            match = match_repo.get_by_id(session, match_id)
+        async with async_session_scope() as session:
+            match = await session.run_sync(match_repo.get_by_id, match_id)
 
             if not match or match.result is None:
                 await ctx.followup.send("Partida não finalizada!")
                 return
 
-            self.match_service.revert_match(session, match)
+            season = await session.run_sync(season_repo.get_last_season)
+            if not season or match.season_id != season.id:
+                await ctx.followup.send("Partidas de seasons encerradas não podem ser revertidas!")
+                return
+
+            await session.run_sync(self.match_service.revert_match, match)
 
             await ctx.followup.send("Partida revertida!")
 
+    @commands.slash_command(
+        name="reverterpartidas", description="Reverte todas as partidas finalizadas em um intervalo"
+    )
+    async def revert_range(
+        self,
+        ctx,
+        first_match_id: Option(int, "Identificador da primeira partida", name="primeira", required=True),
+        last_match_id: Option(int, "Identificador da última partida", name="ultima", required=True),
+    ):
+        await ctx.response.defer()
+        if not ctx.guild_id:
+            await ctx.followup.send("Esse comando deve ser usado em um servidor")
+            return
+
+        if not ctx.user.guild_permissions.administrator:
+            await ctx.followup.send("Somente admins podem usar esse comando")
+            return
+
+        async with async_session_scope() as session:
+            matches = await session.run_sync(match_repo.get_finished_in_range, first_match_id, last_match_id)
+            season = await session.run_sync(season_repo.get_last_season)
+
+            # Points and stats were reset with the season, so only its own matches can be taken back from them.
+            skipped_ids = [match.id for match in matches if not season or match.season_id != season.id]
+            matches = [match for match in matches if season and match.season_id == season.id]
+
+            message = ""
+            if skipped_ids:
+                message = f"Partidas de seasons encerradas ignoradas: {', '.join(map(str, skipped_ids))}\n"
+
+            if not matches:
+                await ctx.followup.send(message + "Nenhuma partida finalizada da season atual no intervalo!")
+                return
+
+            match_ids = [match.id for match in matches]
+            await session.run_sync(self.match_service.revert_matches, matches)
+
+            await ctx.followup.send(message + f"{len(match_ids)} partidas revertidas: {', '.join(map(str, match_ids))}")
+
+    @commands.slash_command(name="recalcular", description="Recalcula o elo das partidas a partir de uma partida")
+    async def replay(
+        self,
+        ctx,
+        match_id: Option(int, "Identificador da partida", required=True),
+        dry_run: Option(bool, "Somente mostrar as diferenças", name="simular", default=True),
+    ):
+        await ctx.response.defer()
+        if not ctx.guild_id:
+            await ctx.followup.send("Esse comando deve ser usado em um servidor")
+            return
+
+        if not ctx.user.guild_permissions.administrator:
+            await ctx.followup.send("Somente admins podem usar esse comando")
+            return
+
+        async with async_session_scope() as session:
+            match = await session.run_sync(match_repo.get_by_id, match_id)
+
+            if not match:
+                await ctx.followup.send("Partida não encontrada!")
+                return
+
+            try:
+                diffs = await session.run_sync(self.elo_replay_service.replay, match, dry_run=dry_run)
+            except ValueError as e:
+                await ctx.followup.send(str(e))
+                return
+
+            lines = [
+                f"<@{diff['player'].discord_id}> `{diff['points_before']}` → `{diff['points_after']}`"
+                for diff in diffs[:25]
+            ]
+
+            embed = discord.Embed(
+                title=f"Recalculo a partir da partida {match_id}{' (simulação)' if dry_run else ''}",
+                description="\n".join(lines) if lines else "Nenhum jogador teve o elo alterado.",
+                color=discord.Colour.blurple(),
+            )
+
+            await ctx.followup.send(embed=embed)
+
     @commands.slash_command(name="monitorar", description="Inicia o monitoramento de uma partida")
     async def monitor(
         self,
@@ -176,8 +332,8 @@ class MatchCog(Cog):
             await ctx.followup.send("Somente admins podem usar esse comando")
             return
 
-        with next(get_session()) as session:
-            match = match_repo.get_by_id(session, match_id)
+        async with async_session_scope() as session:
+            match = await session.run_sync(match_repo.get_by_id, match_id)
 
             if not match:
                 await ctx.followup.send("Partida não encontrada!")
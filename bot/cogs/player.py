@@ -8,7 +8,7 @@ from discord.ext import commands
 from bot.main import PorozudoBot
 from shared.model.database import Player
 from shared.repos import player_repo
-from shared.repos.database import get_session
+from shared.repos.database import async_session_scope
 
 logger = logging.getLogger("c/player")
 
@@ -21,21 +21,21 @@ class PlayerCog(Cog):
     @commands.slash_command(name="registrar", description="Adicionar jogador")
     async def register_new_player(self, ctx, nome: str, user: discord.User):
         await ctx.response.defer(ephemeral=True)
-        with next(get_session()) as session:
-            player_repo.create_player(session, Player(username=nome, discord_id=str(user.id)))
+        async with async_session_scope() as session:
+            await session.run_sync(player_repo.create_player, Player(username=nome, discord_id=str(user.id)))
             await ctx.followup.send(f"{nome} registrado com sucesso.")
 
     @commands.slash_command(name="conectarriot", description="Conecta a conta do usuário com o id da conta riot")
     async def connect_riot(self, ctx, game_name: str, tag_line: str):
         await ctx.response.defer(ephemeral=True)
-        with next(get_session()) as session:
+        async with async_session_scope() as session:
             try:
                 player_data = await self.riot_client.get_puuid_by_riot_name(game_name, tag_line)
-                player = player_repo.get_player_by_discord(session, str(ctx.author.id))
+                player = await session.run_sync(player_repo.get_player_by_discord, str(ctx.author.id))
 
                 player.puuid = player_data.puuid
 
-                player_repo.update_player(session, player)
+                await session.run_sync(player_repo.update_player, player)
 
                 logger.info(f"Account linked: {player.id} -> {player.puuid}.")
 
@@ -6,7 +6,7 @@ from bot.main import PorozudoBot
 from bot.ui.views import DeleteButtons, TeamSelectView
 from bot.utils.embed import create_active_players_embed
 from shared.repos import config_repo, player_repo
-from shared.repos.database import get_session
+from shared.repos.database import async_session_scope
 
 
 class QueueCog(Cog):
@@ -28,7 +28,7 @@ class QueueCog(Cog):
     )
     async def add_channel_active_players(self, ctx: discord.ApplicationContext):
         await ctx.response.defer(ephemeral=True)
-        with next(get_session()) as session:
+        async with async_session_scope() as session:
             if not ctx.user.guild_permissions.administrator:
                 await ctx.followup.send("Somente admins podem usar esse comando")
                 return
@@ -40,32 +40,34 @@ class QueueCog(Cog):
                 await ctx.followup.send("É necessário estar conectado a um canal de voz para executar esse comando!")
                 return
 
-            players = player_repo.get_players_by_discord_ids(session, [str(uid) for uid in voice.channel.voice_states])
-            config_repo.clear_player_pool(session)
-            config_repo.add_to_pool(session, players)
+            players = await session.run_sync(
+                player_repo.get_players_by_discord_ids, [str(uid) for uid in voice.channel.voice_states]
+            )
+            await session.run_sync(config_repo.clear_player_pool)
+            await session.run_sync(config_repo.add_to_pool, players)
 
             await ctx.followup.send(f"Os jogadores do canal {voice.channel.name} foram adicionados a lista de ativos!")
 
     @commands.slash_command(name="limpar", description="Apaga todos os jogadores da lista de ativos")
     async def clear_active_players(self, ctx):
         await ctx.response.defer(ephemeral=True)
-        with next(get_session()) as session:
+        async with async_session_scope() as session:
             if not ctx.user.guild_permissions.administrator:
                 await ctx.followup.send("Somente admins podem usar esse comando")
                 return
 
-            config_repo.clear_player_pool(session)
+            await session.run_sync(config_repo.clear_player_pool)
             await ctx.followup.send("A lista de jogadores ativos foi esvaziada!")
 
     @commands.slash_command(name="ativos", description="Mostra os jogadores ativos")
     async def list_active_players(self, ctx):
         await ctx.response.defer()
-        with next(get_session()) as session:
+        async with async_session_scope() as session:
             if not ctx.user.guild_permissions.administrator:
                 await ctx.followup.send("Somente admins podem usar esse comando")
                 return
 
-            players = config_repo.get_pool_players(session)
+            players = await session.run_sync(config_repo.get_pool_players)
             embed = create_active_players_embed(players)
             await ctx.followup.send(embed=embed, view=DeleteButtons(players))
 
@@ -6,8 +6,9 @@ from discord.ext import commands
 
 from bot.main import PorozudoBot
 from bot.utils.embed import create_match_history_embed
+from shared.cache.leaderboard import leaderboard
 from shared.repos import match_repo, player_repo, season_repo, stat_repo
-from shared.repos.database import get_session
+from shared.repos.database import async_session_scope
 
 logger = logging.getLogger("c/stats")
 
@@ -38,17 +39,17 @@ class StatsCog(Cog):
         ),
     ):
         await ctx.response.defer(ephemeral=True)
-        with next(get_session()) as session:
+        async with async_session_scope() as session:
             if not season or season < 1:
-                season_db = season_repo.get_last_season(session)
+                season_db = await session.run_sync(season_repo.get_last_season)
             else:
-                season_db = season_repo.get_by_id(session, season)
+                season_db = await session.run_sync(season_repo.get_by_id, season)
 
             if not season_db:
                 await ctx.followup.send("Nenhum dado encontrado para a season especificada.")
                 return
 
-            stats = stat_repo.get_players_stat(session, mode, season_db.id)
+            stats = await session.run_sync(stat_repo.get_players_stat, mode, season_db.id)
 
             result_list = sorted(stats.values(), key=lambda x: x["wins"], reverse=True)
 
@@ -88,17 +89,17 @@ class StatsCog(Cog):
         ),
     ):
         await ctx.response.defer(ephemeral=True)
-        with next(get_session()) as session:
+        async with async_session_scope() as session:
             if not season or season < 1:
-                season_db = season_repo.get_last_season(session)
+                season_db = await session.run_sync(season_repo.get_last_season)
             else:
-                season_db = season_repo.get_by_id(session, season)
+                season_db = await session.run_sync(season_repo.get_by_id, season)
 
             if not season_db:
                 await ctx.followup.send("Season invalida, consultar seasons atravez do comando '''/seasons'''.")
                 return
 
-            stats = stat_repo.get_players_stat(session, mode, season_db.id)
+            stats = await session.run_sync(stat_repo.get_players_stat, mode, season_db.id)
 
             filtered_stats = {player_id: data for player_id, data in stats.items() if data["games"] >= minimal}
 
@@ -130,35 +131,26 @@ class StatsCog(Cog):
         limit: Option(int, "Limite de partidas", name="limite", default=10, min_value=1, max_value=50),
     ):
         await ctx.response.defer(ephemeral=True)
-        with next(get_session()) as session:
-            player = player_repo.get_player_by_discord(session, str(user.id if user else ctx.author.id))
+        async with async_session_scope() as session:
+            player = await session.run_sync(player_repo.get_player_by_discord, str(user.id if user else ctx.author.id))
+            matches = await session.run_sync(match_repo.get_history_by_player, player.id, limit)
 
-            matches = match_repo.get_all_finished_by_player(session, player.id, limit)
-
-            embed = create_match_history_embed(matches, player)
-
-            await ctx.followup.send(embed=embed)
+        await ctx.followup.send(embed=create_match_history_embed(matches, player))
 
     @commands.slash_command(name="elo", description="Mostra o ranking de Elo dos jogadores.")
     async def ranking(self, ctx: ApplicationContext):
         await ctx.response.defer(ephemeral=True)
 
-        with next(get_session()) as session:
-            all_ranked_players = player_repo.get_all_players_ranked(session)
+        async with async_session_scope() as session:
+            top_players = await session.run_sync(leaderboard.top, 10)
 
-        if not all_ranked_players:
+            author = await session.run_sync(leaderboard.get_by_discord, str(ctx.user.id))
+            author_rank = await session.run_sync(leaderboard.rank, author.id) if author else None
+
+        if not top_players:
             await ctx.followup.send("Ainda não há jogadores no ranking.")
             return
 
-        author_id = str(ctx.user.id)
-        author_rank_data = None
-        for rank, player in enumerate(all_ranked_players, start=1):
-            if player.discord_id == author_id:
-                author_rank_data = {"rank": rank, "player": player}
-                break
-
-        top_players = all_ranked_players[:10]
-
         embed = Embed(title="🏆 Ranking de Elo", color=Color.gold())
 
         top_description = []
@@ -170,11 +162,10 @@ class StatsCog(Cog):
 
         embed.description = "\n".join(top_description)
 
-        if author_rank_data and author_rank_data["rank"] > 10:
-            author = author_rank_data["player"]
+        if author_rank and author_rank > 10:
             embed.add_field(
                 name="Sua Posição",
-                value=f"**{author_rank_data['rank']}.** <@{author.discord_id}> - `{author.points}` Pontos",
+                value=f"**{author_rank}.** <@{author.discord_id}> - `{author.points}` Pontos",
                 inline=False,
             )
 
@@ -183,8 +174,8 @@ class StatsCog(Cog):
     @commands.slash_command(name="seasons", description="Exibe uma lista com as seasons")
     async def seasons(self, ctx: ApplicationContext):
         await ctx.response.defer(ephemeral=True)
-        with next(get_session()) as session:
-            all_seasons = season_repo.get_all_seasons(session)
+        async with async_session_scope() as session:
+            all_seasons = await session.run_sync(season_repo.get_all_seasons)
 
             if not all_seasons:
                 await ctx.followup.send("Nenhuma temporada foi encontrada no histórico.")
@@ -16,4 +16,20 @@ LAVALINK_URL = os.getenv("LAVALINK_URL", "127.0.0.1")
 LAVALINK_PORT = int(os.getenv("LAVALINK_PORT", 2333))
 LAVALINK_PASSWORD = os.getenv("LAVALINK_PASSWORD", "youshallnotpass")
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./resources/database.db")
+TEAM_POOL_SIZE = int(os.getenv("TEAM_POOL_SIZE", 10))
+TEAM_BALANCE_TIME_BUDGET = float(os.getenv("TEAM_BALANCE_TIME_BUDGET", 0.15))
+TEAM_HISTORY_MATCHES = int(os.getenv("TEAM_HISTORY_MATCHES", 10))
+CHAMPION_HISTORY_MATCHES = int(os.getenv("CHAMPION_HISTORY_MATCHES", 0))
+
+# Memory for decoded champion images; a 120x120 RGBA tile takes 56KB, so the default holds the whole roster.
+CHAMPION_ATLAS_MAX_MB = int(os.getenv("CHAMPION_ATLAS_MAX_MB", 16))
+
+# Team images sent on /sortear: "png", "webp" (lossless) or "jpeg".
+CHAMPION_IMAGE_FORMAT = os.getenv("CHAMPION_IMAGE_FORMAT", "png").lower()
+CHAMPION_IMAGE_PNG_COMPRESS_LEVEL = int(os.getenv("CHAMPION_IMAGE_PNG_COMPRESS_LEVEL", 1))
+CHAMPION_IMAGE_JPEG_QUALITY = int(os.getenv("CHAMPION_IMAGE_JPEG_QUALITY", 90))
+CHAMPION_IMAGE_CACHE_SIZE = int(os.getenv("CHAMPION_IMAGE_CACHE_SIZE", 64))
+# Threads rendering team images off the event loop; two let both teams of a match render at the same time.
+IMAGE_RENDER_WORKERS = int(os.getenv("IMAGE_RENDER_WORKERS", 2))
+# Direct messages sent at the same time when a match is announced.
+DM_CONCURRENCY = int(os.getenv("DM_CONCURRENCY", 5))
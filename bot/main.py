@@ -6,7 +6,19 @@ import aiohttp
 import discord
 
 from bot.client.riot_client import RiotAPIClient
-from bot.config import BOT_TOKEN, RIOT_API_KEY
+from bot.config import (
+    BOT_TOKEN,
+    CHAMPION_ATLAS_MAX_MB,
+    CHAMPION_IMAGE_CACHE_SIZE,
+    CHAMPION_IMAGE_FORMAT,
+    CHAMPION_IMAGE_JPEG_QUALITY,
+    CHAMPION_IMAGE_PNG_COMPRESS_LEVEL,
+    IMAGE_RENDER_WORKERS,
+    RIOT_API_KEY,
+)
+from bot.service.image_service import ImageRenderService
+from bot.team_generator.champion_sampler import ChampionSampler
+from bot.utils.champion_image import ChampionAtlas, ImageEncoder, TeamImageRenderer
 from shared.repos.champions_repo import ImageDict
 
 logging.basicConfig(format="%(levelname)s %(name)s %(asctime)s: %(message)s", level=logging.INFO)
@@ -20,9 +32,27 @@ class PorozudoBot(discord.Bot):
         self.http_session = aiohttp.ClientSession()
         self.riot_client = RiotAPIClient(api_key=RIOT_API_KEY, session=self.http_session)
         self.champion_data = ImageDict()
+        self.champion_sampler = ChampionSampler(self.champion_data)
+        self.champion_atlas = self._build_atlas()
+        self.image_service = ImageRenderService(
+            TeamImageRenderer(
+                ImageEncoder(CHAMPION_IMAGE_FORMAT, CHAMPION_IMAGE_PNG_COMPRESS_LEVEL, CHAMPION_IMAGE_JPEG_QUALITY),
+                CHAMPION_IMAGE_CACHE_SIZE,
+            ),
+            IMAGE_RENDER_WORKERS,
+        )
+
+    def _build_atlas(self) -> ChampionAtlas:
+        return ChampionAtlas(self.champion_data, CHAMPION_ATLAS_MAX_MB * 1024 * 1024, self.champion_data.version)
+
+    async def update_champion_data(self):
+        if await self.champion_data.update_data(self.http_session):
+            self.champion_sampler = ChampionSampler(self.champion_data)
+            self.champion_atlas = self._build_atlas()
 
     async def close(self):
         await super().close()
+        self.image_service.shutdown()
         if self.http_session:
             await self.http_session.close()
 
@@ -0,0 +1,30 @@
+import argparse
+import logging
+
+from bot.service.elo_replay_service import EloReplayService
+from shared.repos import match_repo
+from shared.repos.database import session_scope
+
+logger = logging.getLogger("replay_elo")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recalcula o elo das partidas da season atual a partir de uma partida")
+    parser.add_argument("match_id", type=int)
+    parser.add_argument("--dry-run", action="store_true", help="Somente mostra as diferenças")
+    args = parser.parse_args()
+
+    with session_scope() as session:
+        match = match_repo.get_by_id(session, args.match_id)
+        if not match:
+            raise SystemExit(f"Match {args.match_id} not found")
+
+        diffs = EloReplayService().replay(session, match, dry_run=args.dry_run)
+
+        for diff in diffs:
+            change = diff["points_after"] - diff["points_before"]
+            print(f"{diff['player'].username}: {diff['points_before']} -> {diff['points_after']} ({change:+d})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,39 @@
 import logging
 
-from shared.model.database import PlayerEloHistory, PlayerSeasonFinalElo, Season
-from shared.repos import elo_repo, player_repo, season_repo
+from shared.cache.leaderboard import leaderboard
+from shared.model.database import Season
+from shared.repos import elo_repo, player_repo, season_repo, stat_repo, version_repo
 
 logger = logging.getLogger("c/match_service")
 
+STARTING_POINTS = 1500
+
 
 class ConfigService:
     def __init__(self):
         self._elo_repo = elo_repo
         self._player_repo = player_repo
         self._season_repo = season_repo
+        self._stat_repo = stat_repo
+        self._version_repo = version_repo
 
     def reset_elo(self, session):
-        players = self._player_repo.get_all_players_ranked(session)
-        season = self._season_repo.get_last_season(session)
+        """
+        Close the current season and start a new one, in a single transaction.
 
-        for player in players:
-            points_before_update = player.points
-            player.points = 1500
-
-            history_entry = PlayerEloHistory(
-                player_id=player.id,
-                match_id=None,
-                points_before=points_before_update,
-                points_after=player.points,
-                change=player.points - points_before_update,
-            )
+        Every player ranked in the season gets their final elo archived and a history entry back to the starting
+        points, through a few set-based statements whatever the number of players.
+        """
+        season = self._season_repo.get_last_season(session)
 
-            season_elo_entry = PlayerSeasonFinalElo(
-                player_id=player.id, season_id=season.id, points=points_before_update
-            )
+        if season:
+            players = self._stat_repo.season_players_query(season.id)
 
-            self._elo_repo.create_history(session, history_entry)
-            self._elo_repo.create_season_history(session, season_elo_entry)
+            self._elo_repo.add_season_final_elos(session, season.id, players)
+            self._elo_repo.add_reset_histories(session, players, STARTING_POINTS)
+            self._player_repo.reset_points(session, players, STARTING_POINTS)
 
-            self._player_repo.update_player(session, player)
+        version = self._version_repo.bump_version(session, version_repo.RESULTS)
+        new_season = self._season_repo.create_season(session, Season())
 
-        season_repo.create_season(session, Season())
+        leaderboard.reset(new_season.id, version)
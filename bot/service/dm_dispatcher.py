@@ -0,0 +1,71 @@
+import asyncio
+import io
+import logging
+from typing import List, Optional, Set, Tuple
+
+import discord
+
+logger = logging.getLogger("c/dm_dispatcher")
+
+# A message for a player: their discord id and a champion embed (see ``create_champion_embed``).
+DirectMessage = Tuple[str, dict]
+
+
+class DMDispatcher:
+    """
+    Sends direct messages concurrently, at most ``concurrency`` at a time.
+
+    Recipients are looked up in the guild's member cache and the bot's user cache first, so only users the bot has
+    not seen yet cost a ``fetch_user`` call. Every DM channel is its own rate limit bucket, whose 429s py-cord
+    already waits out; the semaphore keeps a whole match from bursting into the global limit at once.
+    """
+
+    def __init__(self, bot: discord.Bot, concurrency: int):
+        self._bot = bot
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def _resolve(self, guild: Optional[discord.Guild], discord_id: int) -> discord.abc.Messageable:
+        user = (guild.get_member(discord_id) if guild else None) or self._bot.get_user(discord_id)
+        if user is None:
+            user = await self._bot.fetch_user(discord_id)
+        return user
+
+    async def _send(self, guild: Optional[discord.Guild], discord_id: str, message: dict):
+        async with self._semaphore:
+            user = await self._resolve(guild, int(discord_id))
+            # Each send reads the same encoded image through its own buffer.
+            file = discord.File(fp=io.BytesIO(message["image"]), filename=message["filename"])
+            await user.send(file=file, embed=message["embed"])
+
+    async def send(
+        self, guild: Optional[discord.Guild], messages: List[DirectMessage]
+    ) -> List[Tuple[str, BaseException]]:
+        """
+        Send every message and return the recipients that could not be reached, with the reason.
+        """
+        results = await asyncio.gather(
+            *(self._send(guild, discord_id, message) for discord_id, message in messages), return_exceptions=True
+        )
+
+        failures = [
+            (discord_id, result)
+            for (discord_id, _), result in zip(messages, results)
+            if isinstance(result, BaseException)
+        ]
+        if failures:
+            logger.warning(
+                f"Failed to send {len(failures)} of {len(messages)} messages: "
+                + ", ".join(f"{discord_id} ({e})" for discord_id, e in failures)
+            )
+
+        return failures
+
+    def dispatch(self, guild: Optional[discord.Guild], messages: List[DirectMessage]) -> asyncio.Task:
+        """
+        ``send`` in the background. The task is kept until it finishes, so the caller can await it or not.
+        """
+        task = asyncio.create_task(self.send(guild, messages))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
@@ -0,0 +1,126 @@
+import logging
+from typing import Dict, List
+
+from bot.service.match_service import _calculate_elo_change, _k_factor
+from shared.cache.leaderboard import leaderboard, snapshot
+from shared.model.database import Match, PlayerEloHistory, TeamSide
+from shared.repos import elo_repo, match_repo, player_repo, season_repo, version_repo
+
+logger = logging.getLogger("c/elo_replay_service")
+
+
+class EloReplayService:
+    def __init__(self):
+        self._elo_repo = elo_repo
+        self._match_repo = match_repo
+        self._player_repo = player_repo
+        self._season_repo = season_repo
+        self._version_repo = version_repo
+
+    def replay(self, session, from_match: Match, dry_run: bool = False) -> List[Dict]:
+        """
+        Recompute the Elo of every finished match of the current season from ``from_match`` onward.
+
+        Only that suffix is replayed: each player's rating before it is their current points minus the active
+        history changes inside it. Team ratings keep the offset they had at draw time, shifted by how much the
+        players' ratings moved (and are saved back), so an unchanged history replays to exactly the same values.
+
+        Returns the players whose points change, as dicts with ``player``, ``points_before`` and ``points_after``.
+        With ``dry_run`` nothing is written.
+        """
+        season = self._season_repo.get_last_season(session)
+        if from_match.season_id != season.id:
+            raise ValueError("Só é possível recalcular partidas da season atual!")
+
+        history = self._elo_repo.get_active_history_from(session, season.id, from_match.created_at)
+        entries = {(entry.match_id, entry.player_id): entry for entry in history}
+
+        players = {
+            player.id: player
+            for player in self._player_repo.get_players_by_ids(session, list({entry.player_id for entry in history}))
+        }
+        ratings = {player_id: player.points for player_id, player in players.items()}
+        for entry in history:
+            ratings[entry.player_id] -= entry.change
+
+        changed_entries = 0
+        new_entries = []
+
+        for match in self._match_repo.stream_finished_from(session, season.id, from_match.created_at):
+            teams = {team.side: team for team in match.teams}
+            k_factor = _k_factor(match.mode)
+
+            team_ratings = {}
+            for side, team in teams.items():
+                shifts = []
+                for player in team.players:
+                    players.setdefault(player.id, player)
+                    ratings.setdefault(player.id, player.points)
+
+                    entry = entries.get((match.id, player.id))
+                    shifts.append(ratings[player.id] - entry.points_before if entry else 0)
+
+                team_ratings[side] = team.team_rating + sum(shifts) / len(shifts)
+
+                if not dry_run and team_ratings[side] != team.team_rating:
+                    team.team_rating = team_ratings[side]
+                    session.add(team)
+
+            for side, team in teams.items():
+                opponent_rating = team_ratings[TeamSide.red if side == TeamSide.blue else TeamSide.blue]
+
+                for player in team.players:
+                    points_before = ratings[player.id]
+                    point_change = _calculate_elo_change(
+                        player_rating=points_before,
+                        opponent_team_rating=opponent_rating,
+                        k_factor=k_factor,
+                        won=side == match.result,
+                    )
+                    ratings[player.id] = points_before + point_change
+
+                    entry = entries.get((match.id, player.id))
+                    if entry is None:
+                        new_entries.append(
+                            PlayerEloHistory(
+                                player_id=player.id,
+                                match_id=match.id,
+                                points_before=points_before,
+                                points_after=ratings[player.id],
+                                change=point_change,
+                            )
+                        )
+                    elif entry.points_before != points_before or entry.change != point_change:
+                        changed_entries += 1
+                        if not dry_run:
+                            entry.points_before = points_before
+                            entry.points_after = ratings[player.id]
+                            entry.change = point_change
+                            session.add(entry)
+
+        diffs = [
+            {"player": players[player_id], "points_before": players[player_id].points, "points_after": points}
+            for player_id, points in ratings.items()
+            if players[player_id].points != points
+        ]
+        diffs.sort(key=lambda diff: diff["points_after"] - diff["points_before"])
+
+        for diff in diffs:
+            logger.info(f"Replay {diff['player'].username}: {diff['points_before']} -> {diff['points_after']}")
+        logger.info(f"Replay from match {from_match.id}: {changed_entries} entries changed, {len(new_entries)} new.")
+
+        if dry_run:
+            return diffs
+
+        for diff in diffs:
+            diff["player"].points = diff["points_after"]
+            session.add(diff["player"])
+
+        self._elo_repo.add_histories(session, new_entries)
+        version = self._version_repo.bump_version(session, version_repo.RESULTS)
+        updated_players = [snapshot(diff["player"]) for diff in diffs]
+        session.commit()
+
+        leaderboard.update_points(updated_players, version)
+
+        return diffs
@@ -0,0 +1,39 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from bot.utils.champion_image import ChampionAtlas, TeamImageRenderer
+
+logger = logging.getLogger("c/image_service")
+
+
+class ImageRenderService:
+    """
+    Renders team images on a pool of worker threads, so composing and encoding them never blocks the event loop.
+
+    Pillow releases the GIL while it pastes and encodes, so images rendered on different workers are built in
+    parallel. Threads rather than processes keep the atlas shared instead of copying it into every worker.
+    """
+
+    def __init__(self, renderer: TeamImageRenderer, workers: int):
+        self._renderer = renderer
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render")
+
+    @property
+    def filename(self) -> str:
+        return self._renderer.encoder.filename
+
+    async def render(self, champions_list: List[str], atlas: ChampionAtlas) -> bytes:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._renderer.render, champions_list, atlas)
+
+    async def render_teams(self, teams: List[List[str]], atlas: ChampionAtlas) -> List[bytes]:
+        """
+        The image of every team, rendered concurrently.
+        """
+        return list(await asyncio.gather(*(self.render(champions_list, atlas) for champions_list in teams)))
+
+    def shutdown(self):
+        logger.info("Shutting down image render workers.")
+        self._executor.shutdown(wait=False, cancel_futures=True)
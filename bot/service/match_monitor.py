@@ -9,7 +9,7 @@ import aiohttp
 from bot.client.riot_client import RiotAPIClient
 from bot.service.match_service import MatchService
 from shared.repos import player_repo
-from shared.repos.database import get_session
+from shared.repos.database import async_session_scope
 
 logger = logging.getLogger("c/champions_m")
 
@@ -45,11 +45,11 @@ class ActiveMatchMonitor:
 
         try:
             while datetime.now() - start_time < timeout:
-                with next(get_session()) as session:
+                async with async_session_scope() as session:
 
                     logger.info("Monitor: Checking active match...")
 
-                    tracked_puuids = set(player_repo.get_all_players_by_match(session, self._match_id))
+                    tracked_puuids = set(await session.run_sync(player_repo.get_all_players_by_match, self._match_id))
 
                     player_to_check = random.choice(list(tracked_puuids))
 
@@ -59,7 +59,9 @@ class ActiveMatchMonitor:
 
                         if tracked_puuids.issubset(participants_in_game):
                             logger.info(f"Monitor: Valid match found! Riot Match ID: {active_game.game_id}")
-                            self.match_service.register_match_champions(self._match_id, active_game)
+                            await session.run_sync(
+                                self.match_service.register_match_champions, self._match_id, active_game
+                            )
                             break
 
                     except aiohttp.ClientResponseError as e:
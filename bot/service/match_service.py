@@ -1,9 +1,11 @@
 import logging
+from collections import defaultdict
+from typing import List
 
+from shared.cache.leaderboard import leaderboard, snapshot
 from shared.model.database import Match, PlayerEloHistory, PlayerMatchChampion, TeamSide
 from shared.model.riot import ActiveGameSchema
-from shared.repos import elo_repo, match_repo, player_champion_repo, player_repo
-from shared.repos.database import get_session
+from shared.repos import elo_repo, match_repo, player_champion_repo, player_repo, stat_repo, version_repo
 
 logger = logging.getLogger("c/match_service")
 
@@ -23,23 +25,31 @@ def _calculate_elo_change(
     return max(1, change) if won else min(-1, change)
 
 
+def _k_factor(mode: int) -> int:
+    return {
+        1: 1,
+        2: 1,
+        3: 5,
+        4: 10,
+        5: 20,
+    }.get(mode, 10)
+
+
 class MatchService:
     def __init__(self):
         self._elo_repo = elo_repo
         self._match_repo = match_repo
         self._player_repo = player_repo
         self._player_champion_repo = player_champion_repo
+        self._stat_repo = stat_repo
+        self._version_repo = version_repo
 
     def finalize_match(self, session, match: Match, result: TeamSide):
         teams = {team.side: team for team in match.teams}
 
-        k_factor = {
-            1: 1,
-            2: 1,
-            3: 5,
-            4: 10,
-            5: 20,
-        }.get(match.mode, 10)
+        k_factor = _k_factor(match.mode)
+
+        histories = []
 
         for side, team in teams.items():
             won = side == result
@@ -57,54 +67,83 @@ class MatchService:
                 points_before = player.points
                 player.points += point_change
 
-                self._elo_repo.create_history(
-                    session,
+                histories.append(
                     PlayerEloHistory(
                         player_id=player.id,
                         match_id=match.id,
                         points_before=points_before,
                         points_after=player.points,
                         change=point_change,
-                    ),
+                    )
                 )
 
+        # History rows, stats, player points and the result are committed together by the match update.
+        self._elo_repo.add_histories(session, histories)
+
+        players = [snapshot(player) for team in teams.values() for player in team.players]
+
         match.result = result
+        self._stat_repo.add_match_stats(session, [match.id])
+        version = self._version_repo.bump_version(session, version_repo.RESULTS)
         self._match_repo.update(session, match)
 
+        leaderboard.record_match(players, match.season_id, version)
+
         logger.info(f"Match {match.id} finished. Winner: {result.value}.")
 
     def revert_match(self, session, match: Match):
-        for entry in match.elo_history:
-            if not entry.is_reverted:
-                player = player_repo.get_player_by_id(session, entry.player_id)
-                if player:
-                    logger.info(f"Revert {player.username}: {player.points} -> {player.points - entry.change})")
-                    player.points -= entry.change
-                    entry.is_reverted = True
-
-        match.result = None
-        self._match_repo.update(session, match)
+        self.revert_matches(session, [match])
+
+    def revert_matches(self, session, matches: List[Match]):
+        match_ids = [match.id for match in matches]
+        entries = self._elo_repo.get_active_history_by_matches(session, match_ids)
+        players = {
+            player.id: player
+            for player in self._player_repo.get_players_by_ids(session, list({entry.player_id for entry in entries}))
+        }
 
-        logger.info(f"Match {match.id} reverted.")
+        for entry in entries:
+            player = players.get(entry.player_id)
+            if player:
+                logger.info(f"Revert {player.username}: {player.points} -> {player.points - entry.change})")
+                player.points -= entry.change
 
-    def register_match_champions(self, match_id, active_game: ActiveGameSchema):
-        with next(get_session()) as session:
-            match = self._match_repo.get_by_id(session, match_id)
+        self._elo_repo.mark_reverted(session, [entry.id for entry in entries])
 
-            if match.champions_registered:
-                return
+        seasons = {match.id: match.season_id for match in matches}
+        reverted_players = defaultdict(list)
+        for entry in entries:
+            if entry.player_id in players:
+                reverted_players[seasons[entry.match_id]].append(snapshot(players[entry.player_id]))
 
-            participants_map = {p.puuid: p for p in active_game.participants}
+        self._stat_repo.remove_match_stats(session, match_ids)
 
-            for team in match.teams:
-                for player in team.players:
-                    participant_data = participants_map.get(player.puuid)
+        for match in matches:
+            match.result = None
+        version = self._version_repo.bump_version(session, version_repo.RESULTS)
+        self._match_repo.update_all(session, matches)
 
-                    if participant_data:
-                        info = PlayerMatchChampion(
-                            player_id=player.id, match_id=match_id, champion_id=str(participant_data.champion_id)
-                        )
-                        self._player_champion_repo.create_player_champion(session, info)
+        leaderboard.revert_matches(reverted_players, version)
 
-            match.champions_registered = True
-            self._match_repo.update(session, match)
+        logger.info(f"Matches {', '.join(map(str, match_ids))} reverted.")
+
+    def register_match_champions(self, session, match_id, active_game: ActiveGameSchema):
+        match = self._match_repo.get_by_id(session, match_id)
+
+        if match.champions_registered:
+            return
+
+        participants_map = {p.puuid: p for p in active_game.participants}
+
+        for team in match.teams:
+            for player in team.players:
+                participant_data = participants_map.get(player.puuid)
+
+                if participant_data:
+                    info = PlayerMatchChampion(
+                        player_id=player.id, match_id=match_id, champion_id=str(participant_data.champion_id)
+                    )
+                    self._player_champion_repo.create_player_champion(session, info, commit=False)
+
+        match.champions_registered = True
+        self._match_repo.update(session, match)
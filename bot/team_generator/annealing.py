@@ -0,0 +1,174 @@
+import heapq
+import itertools
+import math
+import random
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+TEAMMATE_WEIGHT = 15.0
+EXPERIENCE_WEIGHT = 2.0
+
+_CLOCK_CHECK_INTERVAL = 64
+_MIN_TEMPERATURE = 0.01
+# The search stops early after this many moves, or once this many moves in a row left the pool unchanged.
+_MAX_ITERATIONS = 300_000
+_STALL_ITERATIONS = 5_000
+
+
+def _pair_weights(num_players: int, recent_teammates: Dict[Tuple[int, int], int]) -> List[List[float]]:
+    weights = [[0.0] * num_players for _ in range(num_players)]
+
+    for (a, b), count in recent_teammates.items():
+        weights[a][b] = weights[b][a] = TEAMMATE_WEIGHT * count
+
+    return weights
+
+
+def score_all_splits(
+    points: Sequence[int],
+    team_size: int,
+    pool_size: int,
+    recent_teammates: Optional[Dict[Tuple[int, int], int]] = None,
+    champion_experience: Optional[Sequence[int]] = None,
+) -> List[Tuple[int, float]]:
+    """
+    The exact counterpart of ``anneal_splits`` for lobbies small enough to enumerate: every split is scored with
+    the same cost, and the ``pool_size`` cheapest come back in the same shape.
+    """
+    num_players = len(points)
+
+    experience = list(champion_experience) if champion_experience else [0] * num_players
+    weights = _pair_weights(num_players, recent_teammates or {})
+
+    total_points = sum(points)
+    total_experience = sum(experience)
+
+    def pairs_of(team):
+        return sum(weights[a][b] for a, b in itertools.combinations(team, 2))
+
+    splits = []
+
+    # Player 0 stays on team A, so every split is scored once.
+    for others in itertools.combinations(range(1, num_players), team_size - 1):
+        team_a = (0,) + others
+        team_b = tuple(idx for idx in range(num_players) if idx not in team_a)
+
+        points_a = sum(points[idx] for idx in team_a)
+        experience_a = sum(experience[idx] for idx in team_a)
+        cost = (
+            abs(2 * points_a - total_points) / team_size
+            + EXPERIENCE_WEIGHT * abs(2 * experience_a - total_experience) / team_size
+            + pairs_of(team_a)
+            + pairs_of(team_b)
+        )
+        splits.append((sum(1 << idx for idx in team_a), cost))
+
+    return heapq.nsmallest(pool_size, splits, key=lambda item: item[1])
+
+
+def anneal_splits(
+    points: Sequence[int],
+    team_size: int,
+    pool_size: int,
+    time_budget: float,
+    recent_teammates: Optional[Dict[Tuple[int, int], int]] = None,
+    champion_experience: Optional[Sequence[int]] = None,
+) -> List[Tuple[int, float]]:
+    """
+    Search for balanced splits with simulated annealing for up to ``time_budget`` seconds, stopping sooner once
+    the pool of best splits stops changing or after ``_MAX_ITERATIONS`` moves.
+
+    The cost of a split is the Elo difference between the team averages, plus ``TEAMMATE_WEIGHT`` for every
+    time two players on the same team played together recently (``recent_teammates`` maps index pairs to counts),
+    plus ``EXPERIENCE_WEIGHT`` times the difference in average champion pool size (``champion_experience``).
+
+    Moves swap one player from each team, and every term is updated incrementally, so a move costs O(1) to
+    evaluate and O(n) to apply. Returns the ``pool_size`` cheapest distinct splits seen as (team_a_mask, cost)
+    pairs ordered by cost, with player 0 always on team A.
+    """
+    deadline = time.perf_counter() + time_budget
+    num_players = len(points)
+
+    experience = list(champion_experience) if champion_experience else [0] * num_players
+    weights = _pair_weights(num_players, recent_teammates or {})
+
+    total_points = sum(points)
+    total_experience = sum(experience)
+
+    team_a = set(random.sample(range(num_players), team_size))
+    team_b = set(range(num_players)) - team_a
+    members_a, members_b = list(team_a), list(team_b)
+
+    sum_points = sum(points[idx] for idx in team_a)
+    sum_experience = sum(experience[idx] for idx in team_a)
+    affinity_a = [sum(weights[idx][other] for other in team_a) for idx in range(num_players)]
+    affinity_b = [sum(weights[idx][other] for other in team_b) for idx in range(num_players)]
+    pair_cost = sum(affinity_a[idx] for idx in team_a) / 2 + sum(affinity_b[idx] for idx in team_b) / 2
+
+    def cost_of(points_a, experience_a, pairs):
+        elo_term = abs(2 * points_a - total_points) / team_size
+        experience_term = EXPERIENCE_WEIGHT * abs(2 * experience_a - total_experience) / team_size
+        return elo_term + experience_term + pairs
+
+    cost = cost_of(sum_points, sum_experience, pair_cost)
+    temperature_start = max(cost, 1.0)
+
+    best = {}
+
+    def remember(mask, mask_cost) -> bool:
+        if mask & 1 == 0:
+            mask ^= (1 << num_players) - 1
+        if mask in best:
+            return False
+        if len(best) < pool_size:
+            best[mask] = mask_cost
+            return True
+        worst_mask = max(best, key=best.get)
+        if mask_cost < best[worst_mask]:
+            del best[worst_mask]
+            best[mask] = mask_cost
+            return True
+        return False
+
+    mask = sum(1 << idx for idx in team_a)
+    remember(mask, cost)
+
+    start = time.perf_counter()
+    iteration = 0
+    last_improvement = 0
+    temperature = temperature_start
+
+    while iteration < _MAX_ITERATIONS and iteration - last_improvement < _STALL_ITERATIONS:
+        iteration += 1
+        if iteration % _CLOCK_CHECK_INTERVAL == 0:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            progress = (now - start) / (deadline - start)
+            temperature = max(temperature_start * (1 - progress) ** 2, _MIN_TEMPERATURE)
+
+        pos_a = random.randrange(team_size)
+        pos_b = random.randrange(team_size)
+        i, j = members_a[pos_a], members_b[pos_b]
+
+        new_points = sum_points - points[i] + points[j]
+        new_experience = sum_experience - experience[i] + experience[j]
+        new_pairs = pair_cost + affinity_b[i] - affinity_a[i] + affinity_a[j] - affinity_b[j] - 2 * weights[i][j]
+        new_cost = cost_of(new_points, new_experience, new_pairs)
+
+        delta = new_cost - cost
+        if delta > 0 and random.random() >= math.exp(-delta / temperature):
+            continue
+
+        members_a[pos_a], members_b[pos_b] = j, i
+        for idx in range(num_players):
+            shift = weights[idx][j] - weights[idx][i]
+            affinity_a[idx] += shift
+            affinity_b[idx] -= shift
+
+        sum_points, sum_experience, pair_cost, cost = new_points, new_experience, new_pairs, new_cost
+        mask ^= (1 << i) | (1 << j)
+        if remember(mask, cost):
+            last_improvement = iteration
+
+    return heapq.nsmallest(pool_size, best.items(), key=lambda item: item[1])
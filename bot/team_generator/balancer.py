@@ -0,0 +1,80 @@
+import bisect
+import heapq
+import itertools
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def _subset_sums(
+    indices: Sequence[int], points: Sequence[int], required: Optional[int] = None
+) -> Dict[int, List[Tuple]]:
+    """
+    Enumerate every subset of ``indices`` grouped by size, as (sum, mask) pairs sorted by sum.
+    """
+    by_size = defaultdict(list)
+
+    for size in range(len(indices) + 1):
+        for combination in itertools.combinations(indices, size):
+            if required is not None and required not in combination:
+                continue
+
+            mask = 0
+            for idx in combination:
+                mask |= 1 << idx
+
+            by_size[size].append((sum(points[idx] for idx in combination), mask))
+
+    for subsets in by_size.values():
+        subsets.sort()
+
+    return by_size
+
+
+def find_balanced_splits(points: Sequence[int], team_size: int, pool_size: int) -> List[Tuple[int, int]]:
+    """
+    Find the ``pool_size`` most balanced splits of ``points`` into two teams of ``team_size``.
+
+    Meet-in-the-middle: both halves of the lobby are enumerated separately (2^(n/2) subsets each) and, for each
+    left subset, the right subsets are walked outwards from the best complement with a shared heap, so only the
+    splits that end up in the pool are ever looked at. Player 0 is always on team A, so every split shows up once.
+
+    Returns (team_a_mask, error) pairs ordered by error, where error is ``abs(sum_a - sum_b)``.
+    """
+    total = sum(points)
+    half = len(points) // 2
+
+    left_sums = _subset_sums(range(half), points, required=0)
+    right_sums = _subset_sums(range(half, len(points)), points)
+    right_totals = {size: [subset_sum for subset_sum, _ in subsets] for size, subsets in right_sums.items()}
+
+    heap = []
+
+    for size, left_subsets in left_sums.items():
+        right_size = team_size - size
+        if right_size not in right_sums:
+            continue
+
+        totals = right_totals[right_size]
+
+        for left_sum, left_mask in left_subsets:
+            pos = bisect.bisect_left(totals, total / 2 - left_sum)
+
+            for idx, step in ((pos - 1, -1), (pos, 1)):
+                if 0 <= idx < len(totals):
+                    error = abs(2 * (left_sum + totals[idx]) - total)
+                    heapq.heappush(heap, (error, left_sum, left_mask, right_size, idx, step))
+
+    splits = []
+
+    while heap and len(splits) < pool_size:
+        error, left_sum, left_mask, right_size, idx, step = heapq.heappop(heap)
+        subsets = right_sums[right_size]
+
+        splits.append((left_mask | subsets[idx][1], error))
+
+        next_idx = idx + step
+        if 0 <= next_idx < len(subsets):
+            next_error = abs(2 * (left_sum + subsets[next_idx][0]) - total)
+            heapq.heappush(heap, (next_error, left_sum, left_mask, right_size, next_idx, step))
+
+    return splits
@@ -0,0 +1,71 @@
+import random
+from typing import AbstractSet, Iterable, List, Sequence
+
+
+class ChampionSampler:
+    """
+    Draws champion ids without replacement from an id tuple built once per champion data update.
+
+    Each draw is a lazy Fisher-Yates step: swaps are recorded in a dict local to the call instead of mutating
+    the tuple, so a draw of k champions costs O(k) and the tuple is never copied.
+    """
+
+    def __init__(self, champion_ids: Iterable[str]):
+        self._ids = tuple(champion_ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _shuffled(self):
+        swaps = {}
+        remaining = len(self._ids)
+
+        while remaining:
+            pick = random.randrange(remaining)
+            remaining -= 1
+
+            yield self._ids[swaps.get(pick, pick)]
+
+            swaps[pick] = swaps.get(remaining, remaining)
+
+    def draw(self, count: int, exclude: AbstractSet[str] = frozenset()) -> List[str]:
+        return self.draw_teams(count, [frozenset()], exclude)[0]
+
+    def draw_teams(
+        self,
+        count: int,
+        team_exclusions: Sequence[AbstractSet[str]],
+        exclude: AbstractSet[str] = frozenset(),
+    ) -> List[List[str]]:
+        """
+        Draw ``count`` champions for each team, alternating between teams like a draft.
+
+        ``exclude`` is skipped for everyone, while ``team_exclusions[i]`` is only skipped for team ``i``. A champion
+        skipped because of a team exclusion is kept aside and offered to the next team that can take it.
+        """
+        stream = self._shuffled()
+        teams = [[] for _ in team_exclusions]
+        set_aside = []
+
+        for _ in range(count):
+            for team, team_exclude in zip(teams, team_exclusions):
+                champion_id = next((_id for _id in set_aside if _id not in team_exclude), None)
+
+                if champion_id is not None:
+                    set_aside.remove(champion_id)
+                else:
+                    for candidate in stream:
+                        if exclude and candidate in exclude:
+                            continue
+                        if candidate in team_exclude:
+                            set_aside.append(candidate)
+                            continue
+                        champion_id = candidate
+                        break
+
+                if champion_id is None:
+                    raise ValueError("Não há campeões suficientes para o sorteio!")
+
+                team.append(champion_id)
+
+        return teams
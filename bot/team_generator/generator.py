@@ -2,67 +2,155 @@ import itertools
 import logging
 import math
 import random
+from enum import Enum
 
+import numpy as np
+
+from bot.team_generator.annealing import anneal_splits, score_all_splits
+from bot.team_generator.balancer import find_balanced_splits
 from shared.model.database import Team, TeamSide
 
 logger = logging.getLogger("team_generator")
 
 
-def generate_teams(players, champions, choices_number):
-    team_size = len(players) // 2
+EXHAUSTIVE_MAX_PLAYERS = 12
 
-    if len(players) % 2 != 0:
-        raise ValueError("O número de jogadores ativos deve ser par!")
 
-    all_combinations = list(itertools.combinations(players, team_size))
+class BalanceStrategy(str, Enum):
+    exhaustive = "exhaustive"
+    annealing = "annealing"
 
-    num_unique_matches = math.ceil(len(all_combinations) / 2)
 
-    matchups = []
+def _exhaustive_matchups(players, team_size, pool_size):
+    num_players = len(players)
+    points = np.fromiter((player.points for player in players), dtype=np.int64, count=num_players)
+
+    # Combinations come out in lexicographic order, so the first half are exactly the ones holding player 0,
+    # i.e. one side of every unique split.
+    num_unique_matches = math.ceil(math.comb(num_players, team_size) / 2)
+    team_a_indices = np.fromiter(
+        itertools.chain.from_iterable(
+            itertools.islice(itertools.combinations(range(num_players), team_size), num_unique_matches)
+        ),
+        dtype=np.intp,
+        count=num_unique_matches * team_size,
+    ).reshape(num_unique_matches, team_size)
 
-    all_players_set = set(players)
+    sums_a = points[team_a_indices].sum(axis=1)
+    sums_b = points.sum() - sums_a
 
-    for i in range(num_unique_matches):
-        team_a = list(all_combinations[i])
-        team_b = list(all_players_set.difference(team_a))
+    ratings_a = sums_a / team_size
+    ratings_b = sums_b / team_size
+    elo_differences = np.abs(ratings_a - ratings_b)
 
-        rating_a = sum(player.points for player in team_a) / team_size
-        rating_b = sum(player.points for player in team_b) / team_size
+    if pool_size < num_unique_matches:
+        best = np.argpartition(elo_differences, pool_size - 1)[:pool_size]
+    else:
+        best = np.arange(num_unique_matches)
+    best = best[np.argsort(elo_differences[best], kind="stable")]
 
-        elo_difference = abs(rating_a - rating_b)
+    matchups = []
+
+    for idx in best:
+        in_team_a = np.zeros(num_players, dtype=bool)
+        in_team_a[team_a_indices[idx]] = True
 
         matchups.append(
             {
-                "team_a": team_a,
-                "team_b": team_b,
-                "rating_a": rating_a,
-                "rating_b": rating_b,
-                "elo_difference": elo_difference,
+                "team_a": [player for player, selected in zip(players, in_team_a) if selected],
+                "team_b": [player for player, selected in zip(players, in_team_a) if not selected],
+                "rating_a": float(ratings_a[idx]),
+                "rating_b": float(ratings_b[idx]),
+                "elo_difference": float(elo_differences[idx]),
             }
         )
 
-    matchups.sort(key=lambda x: x["elo_difference"])
+    return matchups
 
-    pool_size = min(10, len(matchups) // 2)
 
-    if pool_size == 0 and len(matchups) > 0:
-        pool_size = len(matchups)
+def _matchup_from_mask(players, mask, team_size):
+    team_a = [player for idx, player in enumerate(players) if mask >> idx & 1]
+    team_b = [player for idx, player in enumerate(players) if not mask >> idx & 1]
 
-    good_matches_pool = matchups[:pool_size]
+    rating_a = sum(player.points for player in team_a) / team_size
+    rating_b = sum(player.points for player in team_b) / team_size
 
-    chosen_match = random.choice(good_matches_pool)
+    return {
+        "team_a": team_a,
+        "team_b": team_b,
+        "rating_a": rating_a,
+        "rating_b": rating_b,
+        "elo_difference": abs(rating_a - rating_b),
+    }
+
+
+def _meet_in_the_middle_matchups(players, team_size, pool_size):
+    return [
+        _matchup_from_mask(players, mask, team_size)
+        for mask, _ in find_balanced_splits([player.points for player in players], team_size, pool_size)
+    ]
 
-    team_a_champion_names = []
-    team_b_champion_names = []
 
-    for i in range(choices_number if choices_number else team_size * 2):
-        choice_a = random.randint(0, len(champions) - 1)
-        team_a_champion_names.append(champions[choice_a]["id"])
-        del champions[choice_a]
+def _annealing_matchups(players, team_size, pool_size, time_budget, recent_teammates, champion_experience):
+    positions = {player.id: idx for idx, player in enumerate(players)}
+
+    teammate_indices = {
+        (positions[a], positions[b]): count
+        for (a, b), count in (recent_teammates or {}).items()
+        if a in positions and b in positions
+    }
+    experience = [(champion_experience or {}).get(player.id, 0) for player in players]
+
+    points = [player.points for player in players]
+    if len(players) <= EXHAUSTIVE_MAX_PLAYERS:
+        splits = score_all_splits(points, team_size, pool_size, teammate_indices, experience)
+    else:
+        splits = anneal_splits(points, team_size, pool_size, time_budget, teammate_indices, experience)
+
+    return [{**_matchup_from_mask(players, mask, team_size), "cost": cost} for mask, cost in splits]
+
+
+def generate_teams(
+    players,
+    champion_sampler,
+    choices_number,
+    pool_size=10,
+    strategy=BalanceStrategy.exhaustive,
+    time_budget=0.15,
+    recent_teammates=None,
+    champion_experience=None,
+    champion_exclusions=None,
+):
+    team_size = len(players) // 2
+
+    if len(players) % 2 != 0:
+        raise ValueError("O número de jogadores ativos deve ser par!")
+
+    num_unique_matches = math.ceil(math.comb(len(players), team_size) / 2)
+
+    pool_size = min(pool_size, num_unique_matches // 2)
+
+    if pool_size == 0 and num_unique_matches > 0:
+        pool_size = num_unique_matches
+
+    if strategy == BalanceStrategy.annealing:
+        good_matches_pool = _annealing_matchups(
+            players, team_size, pool_size, time_budget, recent_teammates, champion_experience
+        )
+    elif len(players) <= EXHAUSTIVE_MAX_PLAYERS:
+        good_matches_pool = _exhaustive_matchups(players, team_size, pool_size)
+    else:
+        good_matches_pool = _meet_in_the_middle_matchups(players, team_size, pool_size)
+
+    chosen_match = random.choice(good_matches_pool)
+
+    champion_exclusions = champion_exclusions or {}
+    team_a_exclusions = set().union(*(champion_exclusions.get(player.id, ()) for player in chosen_match["team_a"]))
+    team_b_exclusions = set().union(*(champion_exclusions.get(player.id, ()) for player in chosen_match["team_b"]))
 
-        choice_b = random.randint(0, len(champions) - 1)
-        team_b_champion_names.append(champions[choice_b]["id"])
-        del champions[choice_b]
+    team_a_champion_names, team_b_champion_names = champion_sampler.draw_teams(
+        choices_number if choices_number else team_size * 2, [team_a_exclusions, team_b_exclusions]
+    )
 
     teams = [
         Team(champions=team_a_champion_names, players=chosen_match["team_a"], team_rating=chosen_match["rating_a"]),
@@ -6,7 +6,7 @@ from bot.service.match_service import MatchService
 from bot.utils.embed import create_active_players_embed
 from shared.model.database import TeamSide
 from shared.repos import config_repo, match_repo, player_repo
-from shared.repos.database import get_session
+from shared.repos.database import async_session_scope
 
 logger = logging.getLogger("c/views")
 
@@ -17,9 +17,11 @@ class TeamSelect(discord.ui.Select):
     """
 
     async def callback(self, interaction: discord.Interaction):
-        with next(get_session()) as session:
-            players = player_repo.get_players_by_discord_ids(session, [str(user.id) for user in self.values])
-            config_repo.add_to_pool(session, players)
+        async with async_session_scope() as session:
+            players = await session.run_sync(
+                player_repo.get_players_by_discord_ids, [str(user.id) for user in self.values]
+            )
+            await session.run_sync(config_repo.add_to_pool, players)
 
             await interaction.response.send_message(
                 content="Os jogadores foram adicionados à lista de ativos.",
@@ -55,9 +57,9 @@ class DeleteButton(discord.ui.Button):
         self.player_id = player_id
 
     async def callback(self, interaction: discord.Interaction):
-        with next(get_session()) as session:
-            config_repo.remove_from_pool(session, int(self.player_id))
-            players = config_repo.get_pool_players(session)
+        async with async_session_scope() as session:
+            await session.run_sync(config_repo.remove_from_pool, int(self.player_id))
+            players = await session.run_sync(config_repo.get_pool_players)
             embed = create_active_players_embed(players)
 
             view = DeleteButtons(players)
@@ -107,14 +109,14 @@ class ResultButtons(discord.ui.View):
             )
             return
 
-        with next(get_session()) as session:
-            match = match_repo.get_by_id(session, self.match_id)
+        async with async_session_scope() as session:
+            match = await session.run_sync(match_repo.get_by_id, self.match_id)
             if not match or match.result is not None:
                 return
 
             match.result = result
 
-            self.match_service.finalize_match(session, match, result)
+            await session.run_sync(self.match_service.finalize_match, match, result)
 
             embeds = interaction.message.embeds
 
@@ -0,0 +1,208 @@
+import io
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+TILE_SIZE = 120
+TILE_BYTES = TILE_SIZE * TILE_SIZE * 4
+
+CANVAS_SIZE = (680, 281)
+TILE_STEP = 133
+MARGIN = 10
+
+# JPEG has no alpha, so the transparent canvas is flattened onto the embed background of Discord's dark theme.
+JPEG_BACKGROUND = (43, 45, 49)
+
+
+class ChampionAtlas:
+    """
+    Champion images of one Data Dragon version decoded into a single RGBA buffer, one tile per champion.
+
+    The bot builds a new atlas whenever the champion data changes. Each champion is decoded the first time it is
+    drawn and keeps its offset in the buffer from then on, so drawing it again is a copy of that region. The buffer
+    holds at most ``max_bytes``: when it is smaller than the whole roster, the least recently drawn champion that
+    isn't being pasted gives its tile to the next one that needs decoding.
+
+    The lock only covers the bookkeeping and the copy of a decoded tile into the buffer; decoding and pasting run
+    outside it, so render threads draw from the atlas at the same time.
+    """
+
+    def __init__(self, champion_data: Mapping[str, dict], max_bytes: int, version: Optional[str] = None):
+        self.version = version
+        # The images are memoryviews over the cache pack, so keeping them here copies nothing and pins this version.
+        self._images: Dict[str, bytes] = {_id: d["image"] for _id, d in champion_data.items()}
+
+        self.capacity = max(1, min(len(self._images), max_bytes // TILE_BYTES))
+        self._buffer = bytearray(self.capacity * TILE_BYTES)
+        self._offsets: OrderedDict[str, int] = OrderedDict()
+        self._free = [slot * TILE_BYTES for slot in reversed(range(self.capacity))]
+        # Pastes in progress per tile, which keep it from being given to another champion meanwhile.
+        self._pins = [0] * self.capacity
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _decode(self, champion_id: str) -> Image.Image:
+        image = Image.open(io.BytesIO(self._images[champion_id])).convert("RGBA")
+        if image.size != (TILE_SIZE, TILE_SIZE):
+            image = image.resize((TILE_SIZE, TILE_SIZE))
+        return image
+
+    def _take_slot(self) -> Optional[int]:
+        if self._free:
+            return self._free.pop()
+
+        for champion_id, offset in self._offsets.items():
+            if not self._pins[offset // TILE_BYTES]:
+                del self._offsets[champion_id]
+                return offset
+
+        return None
+
+    def _acquire(self, champion_id: str) -> Tuple[Optional[int], Optional[Image.Image]]:
+        """
+        The offset of the tile of ``champion_id``, pinned, decoding it into the buffer if it isn't there yet. When
+        every tile is being pasted, the decoded image comes back instead, without an offset.
+        """
+        with self._lock:
+            offset = self._offsets.get(champion_id)
+            if offset is not None:
+                self._offsets.move_to_end(champion_id)
+                self._pins[offset // TILE_BYTES] += 1
+                return offset, None
+
+        # Decoded without the lock, so other threads keep pasting meanwhile.
+        image = self._decode(champion_id)
+
+        with self._lock:
+            offset = self._offsets.get(champion_id)
+            if offset is None:
+                offset = self._take_slot()
+                if offset is None:
+                    return None, image
+
+                self._buffer[offset : offset + TILE_BYTES] = image.tobytes()
+                self._offsets[champion_id] = offset
+            else:
+                self._offsets.move_to_end(champion_id)
+
+            self._pins[offset // TILE_BYTES] += 1
+            return offset, None
+
+    def paste(self, canvas: Image.Image, champion_id: str, position: Tuple[int, int]):
+        """
+        Copy the tile of ``champion_id`` into ``canvas`` at ``position``.
+        """
+        offset, image = self._acquire(champion_id)
+        if offset is None:
+            canvas.paste(image, position)
+            return
+
+        try:
+            # A view over the buffer, not a copy; the pin keeps the tile from being reused while it is pasted.
+            tile = Image.frombuffer(
+                "RGBA",
+                (TILE_SIZE, TILE_SIZE),
+                memoryview(self._buffer)[offset : offset + TILE_BYTES],
+                "raw",
+                "RGBA",
+                0,
+                1,
+            )
+            canvas.paste(tile, position)
+        finally:
+            with self._lock:
+                self._pins[offset // TILE_BYTES] -= 1
+
+
+_font = ImageFont.load_default(30)
+
+
+def compose_champions(champions_list: List[str], atlas: ChampionAtlas) -> Image.Image:
+    max_width, max_height = CANVAS_SIZE
+    new_im = Image.new("RGBA", CANVAS_SIZE, (255, 0, 0, 0))
+    new_im_draw = ImageDraw.Draw(new_im)
+
+    x_offset = MARGIN
+    y_offset = MARGIN
+    for idx, _id in enumerate(champions_list):
+        atlas.paste(new_im, _id, (x_offset, y_offset))
+
+        new_im_draw.text(
+            (x_offset + 5, y_offset), str(idx + 1), font=_font, fill="white", stroke_width=2, stroke_fill="black"
+        )
+
+        x_offset += TILE_STEP
+        if x_offset >= max_width - MARGIN:
+            x_offset = MARGIN
+            y_offset += TILE_STEP
+
+    return new_im
+
+
+class ImageEncoder:
+    """
+    Encodes team images as PNG (``png_compress_level`` from 0 to 9), lossless WebP or JPEG (``jpeg_quality``).
+    """
+
+    EXTENSIONS = {"png": "png", "webp": "webp", "jpeg": "jpg"}
+
+    def __init__(self, image_format: str = "png", png_compress_level: int = 6, jpeg_quality: int = 90):
+        if image_format not in self.EXTENSIONS:
+            raise ValueError(f"Unknown image format '{image_format}', expected one of {', '.join(self.EXTENSIONS)}")
+
+        self.image_format = image_format
+        self.png_compress_level = png_compress_level
+        self.jpeg_quality = jpeg_quality
+        self.filename = f"image.{self.EXTENSIONS[image_format]}"
+
+    def encode(self, image: Image.Image) -> bytes:
+        image_buffer = io.BytesIO()
+
+        if self.image_format == "png":
+            image.save(image_buffer, format="PNG", compress_level=self.png_compress_level)
+        elif self.image_format == "webp":
+            image.save(image_buffer, format="WEBP", lossless=True)
+        else:
+            background = Image.new("RGB", image.size, JPEG_BACKGROUND)
+            background.paste(image, mask=image.getchannel("A"))
+            background.save(image_buffer, format="JPEG", quality=self.jpeg_quality)
+
+        return image_buffer.getvalue()
+
+
+class TeamImageRenderer:
+    """
+    Composes and encodes team images, keeping the last ``cache_size`` of them.
+
+    Images are cached by the ordered champion ids and the Data Dragon version of the atlas, so the same draft is
+    only rendered once and a new version never serves images of the previous one.
+    """
+
+    def __init__(self, encoder: ImageEncoder, cache_size: int):
+        self.encoder = encoder
+        self.cache_size = cache_size
+
+        self._lock = threading.Lock()
+        self._images: OrderedDict[Tuple[Tuple[str, ...], Optional[str]], bytes] = OrderedDict()
+
+    def render(self, champions_list: List[str], atlas: ChampionAtlas) -> bytes:
+        key = (tuple(champions_list), atlas.version)
+
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                return image
+
+        image = self.encoder.encode(compose_champions(champions_list, atlas))
+
+        with self._lock:
+            self._images[key] = image
+            while len(self._images) > self.cache_size:
+                self._images.popitem(last=False)
+
+        return image
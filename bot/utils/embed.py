@@ -1,42 +1,20 @@
-import io
 from typing import List
 
 import discord
-from PIL import Image, ImageDraw
 
 from shared.model.database import Player
 from shared.repos.champions_repo import ImageDict
-
-
-def create_image_from_champions(champions_list: list[str], data: ImageDict) -> io.BytesIO:
-    max_width, max_height = 680, 281
-    new_im = Image.new("RGBA", (max_width, max_height), (255, 0, 0, 0))
-    new_im_draw = ImageDraw.Draw(new_im)
-
-    x_offset = 10
-    y_offset = 10
-    for idx, _id in enumerate(champions_list):
-        champion_data = data[_id]
-        img = Image.open(io.BytesIO(champion_data["image"]))
-        new_im.paste(img, (x_offset, y_offset))
-
-        new_im_draw.text(
-            (x_offset + 5, y_offset), str(idx + 1), font_size=30, fill="white", stroke_width=2, stroke_fill="black"
-        )
-
-        x_offset += 133
-        if x_offset >= max_width - 10:
-            x_offset = 10
-            y_offset += 133
-
-    image_buffer = io.BytesIO()
-    new_im.save(image_buffer, format="PNG")
-    image_buffer.seek(0)
-    return image_buffer
+from shared.repos.match_repo import MatchHistoryRow
 
 
 def create_champion_embed(
-    champions_list: list[str], data: ImageDict, colour: discord.Colour, team: int, players: List[Player]
+    champions_list: list[str],
+    data: ImageDict,
+    image: bytes,
+    filename: str,
+    colour: discord.Colour,
+    team: int,
+    players: List[Player],
 ) -> dict:
     if team == 1:
         embed_description = (
@@ -53,15 +31,14 @@ def create_champion_embed(
 
     embed_description += "\n**Time:**\n```\n" + "\n".join([player.username for player in players]) + "\n```"
 
-    image_buffer = create_image_from_champions(champions_list, data)
     embed = discord.Embed(
         title="Só os bonecudos",
         description=embed_description,
         color=colour,
     )
-    embed.set_image(url="attachment://image.png")
+    embed.set_image(url=f"attachment://{filename}")
 
-    return {"embed": embed, "file": image_buffer}
+    return {"embed": embed, "image": image, "filename": filename}
 
 
 def create_active_players_embed(players):
@@ -79,7 +56,7 @@ def create_active_players_embed(players):
     return embed
 
 
-def create_match_history_embed(matches, player):
+def create_match_history_embed(matches: List[MatchHistoryRow], player):
     """
     Create an embed displaying the last matches of player.
     """
@@ -92,12 +69,7 @@ def create_match_history_embed(matches, player):
     for match in matches:
         match_date = match.created_at.strftime("%d/%m/%Y %H:%M")
         mode = match.mode
-        player_team = next((team for team in match.teams if player in team.players), None)
-
-        if player_team and player_team.side == match.result:
-            result_text = "Vitória"
-        else:
-            result_text = "Derrota"
+        result_text = "Vitória" if match.side == match.result else "Derrota"
 
         embed.add_field(name=f"{match_date} - {mode}x{mode}", value=result_text, inline=False)
     return embed
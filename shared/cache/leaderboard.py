@@ -0,0 +1,227 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+from sqlmodel import Session
+
+from shared.model.database import Player
+from shared.repos import player_repo, season_repo, version_repo
+
+logger = logging.getLogger("leaderboard")
+
+
+def snapshot(player: Player) -> Player:
+    """
+    Detached copy of a player, safe to keep after its session commits or closes.
+    """
+    return Player(**player.model_dump())
+
+
+class Leaderboard:
+    """
+    Elo ranking of the current season kept in memory, reloaded when the results version in the database moves.
+    """
+
+    def __init__(self, max_age: Optional[float] = None, version_ttl: float = 1.0):
+        self.max_age = max_age
+        self.version_ttl = version_ttl
+
+        self._lock = threading.RLock()
+        self._keys = SortedList()
+        self._players: Dict[int, Player] = {}
+        self._games: Dict[int, int] = {}
+        self._discord_ids: Dict[str, int] = {}
+        self._season_id: Optional[int] = None
+        self._version: Optional[int] = None
+        self._version_read_at = 0.0
+        self._loaded_at: Optional[float] = None
+
+    def _is_fresh(self, session: Session) -> bool:
+        if self._loaded_at is None:
+            return False
+
+        now = time.monotonic()
+        if self.max_age is not None and now - self._loaded_at >= self.max_age:
+            return False
+
+        if now - self._version_read_at >= self.version_ttl:
+            self._version_read_at = now
+            return version_repo.get_version(session, version_repo.RESULTS) == self._version
+
+        return True
+
+    def _advance(self, version: int) -> bool:
+        """
+        Whether a change pushed with ``version`` should be applied. A version already loaded is skipped, and a gap
+        means someone else changed the results in between, so the next read reloads instead.
+        """
+        if self._loaded_at is None or version <= self._version:
+            return False
+
+        if version != self._version + 1:
+            self._loaded_at = None
+            return False
+
+        self._version = version
+        return True
+
+    def _insert(self, player: Player):
+        self._players[player.id] = player
+        self._discord_ids[player.discord_id] = player.id
+        self._keys.add((-player.points, player.id))
+
+    def _remove(self, player_id: int):
+        player = self._players.pop(player_id, None)
+        if player:
+            self._discord_ids.pop(player.discord_id, None)
+            self._keys.remove((-player.points, player_id))
+
+    def load(self, session: Session):
+        with self._lock:
+            # The version is bumped in the same transaction as every change, so if it is the same before and after
+            # the reads, they all saw the results of that version.
+            version = version_repo.get_version(session, version_repo.RESULTS)
+            while True:
+                season = season_repo.get_last_season(session)
+                ranked = player_repo.get_all_players_ranked_with_games(session)
+
+                loaded_version, version = version, version_repo.get_version(session, version_repo.RESULTS)
+                if version == loaded_version:
+                    break
+
+            self._season_id = season.id if season else None
+            self._players, self._games, self._discord_ids = {}, {}, {}
+
+            for player, games in ranked:
+                self._games[player.id] = games
+                self._players[player.id] = snapshot(player)
+                self._discord_ids[player.discord_id] = player.id
+
+            self._keys = SortedList((-player.points, player.id) for player in self._players.values())
+
+            self._version = version
+            self._loaded_at = self._version_read_at = time.monotonic()
+            logger.info(f"Leaderboard loaded with {len(self._keys)} players.")
+
+    def ensure_loaded(self, session: Session):
+        with self._lock:
+            if not self._is_fresh(session):
+                self.load(session)
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def top(self, session: Session, limit: int, offset: int = 0) -> List[Player]:
+        with self._lock:
+            self.ensure_loaded(session)
+            return [self._players[player_id] for _, player_id in self._keys.islice(offset, offset + limit)]
+
+    def top_after(self, session: Session, limit: int, after: Optional[Tuple[int, int]] = None) -> List[Player]:
+        """
+        Keyset page: the ``limit`` players ranked right after the ``(points, id)`` cursor, or from the top without one.
+
+        Unlike an offset, the cursor keeps its place when players above it gain or lose points between pages.
+        """
+        with self._lock:
+            self.ensure_loaded(session)
+
+            start = self._keys.bisect_right((-after[0], after[1])) if after else 0
+            return [self._players[player_id] for _, player_id in self._keys.islice(start, start + limit)]
+
+    def all(self, session: Session) -> List[Player]:
+        with self._lock:
+            self.ensure_loaded(session)
+            return [self._players[player_id] for _, player_id in self._keys]
+
+    def rank(self, session: Session, player_id: int) -> Optional[int]:
+        with self._lock:
+            self.ensure_loaded(session)
+
+            player = self._players.get(player_id)
+            if not player:
+                return None
+
+            return self._keys.bisect_left((-player.points, player_id)) + 1
+
+    def get(self, session: Session, player_id: int) -> Optional[Player]:
+        with self._lock:
+            self.ensure_loaded(session)
+            return self._players.get(player_id)
+
+    def get_by_discord(self, session: Session, discord_id: str) -> Optional[Player]:
+        with self._lock:
+            self.ensure_loaded(session)
+            player_id = self._discord_ids.get(discord_id)
+            return self._players[player_id] if player_id is not None else None
+
+    def count(self, session: Session) -> int:
+        with self._lock:
+            self.ensure_loaded(session)
+            return len(self._keys)
+
+    def record_match(self, players: Iterable[Player], season_id: Optional[int], version: int):
+        """
+        Add a finished match of ``season_id``: ``players`` are taken with their points after it, before the commit
+        expires them. A match of another season doesn't count towards the ranking, only the new points do.
+        """
+        with self._lock:
+            if not self._advance(version):
+                return
+
+            if season_id != self._season_id:
+                self._update_points(players)
+                return
+
+            for player in players:
+                self._remove(player.id)
+                self._games[player.id] = self._games.get(player.id, 0) + 1
+                self._insert(snapshot(player))
+
+    def revert_matches(self, players_by_season: Dict[Optional[int], List[Player]], version: int):
+        """
+        Remove one finished match per player entry, grouped by the season of the match and taken with their points
+        after the revert. Like ``record_match``, a match of another season only moves points.
+        """
+        with self._lock:
+            if not self._advance(version):
+                return
+
+            for season_id, players in players_by_season.items():
+                if season_id != self._season_id:
+                    self._update_points(players)
+                    continue
+
+                for player in players:
+                    self._remove(player.id)
+                    self._games[player.id] = self._games.get(player.id, 1) - 1
+
+                    if self._games[player.id] > 0:
+                        self._insert(snapshot(player))
+                    else:
+                        del self._games[player.id]
+
+    def _update_points(self, players: Iterable[Player]):
+        for player in players:
+            if player.id in self._players:
+                self._remove(player.id)
+                self._insert(snapshot(player))
+
+    def update_points(self, players: Iterable[Player], version: int):
+        with self._lock:
+            if self._advance(version):
+                self._update_points(players)
+
+    def reset(self, season_id: int, version: int):
+        """
+        A new season starts with nobody ranked.
+        """
+        with self._lock:
+            if self._advance(version):
+                self._keys, self._players, self._games, self._discord_ids = SortedList(), {}, {}, {}
+                self._season_id = season_id
+
+
+leaderboard = Leaderboard()
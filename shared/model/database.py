@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -29,12 +29,22 @@ class Player(SQLModel, table=True):
 
 class PlayerTeam(SQLModel, table=True):
     player_id: Optional[int] = Field(primary_key=True, foreign_key="player.id")
-    team_id: Optional[int] = Field(primary_key=True, foreign_key="team.id")
+    team_id: Optional[int] = Field(primary_key=True, foreign_key="team.id", index=True)
 
 
 class Match(SQLModel, table=True):
+    __table_args__ = (
+        Index(
+            "ix_match_finished_season_id_created_at",
+            "season_id",
+            "created_at",
+            sqlite_where=text("result IS NOT NULL"),
+            postgresql_where=text("result IS NOT NULL"),
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True, index=True)
-    created_at: datetime = Field(default_factory=datetime.now, nullable=False)
+    created_at: datetime = Field(default_factory=datetime.now, nullable=False, index=True)
     mode: int = Field(ge=1, le=5)
     season_id: Optional[int] = Field(default=None, foreign_key="season.id")
     champions_registered: bool = Field(default=False, nullable=False)
@@ -50,7 +60,7 @@ class Team(SQLModel, table=True):
     side: TeamSide
     champions: List[str] = Field(sa_column=Column(JSON))
     team_rating: float
-    match_id: Optional[int] = Field(default=None, foreign_key="match.id")
+    match_id: Optional[int] = Field(default=None, foreign_key="match.id", index=True)
 
     players: List["Player"] = Relationship(link_model=PlayerTeam)
     match: "Match" = Relationship(back_populates="teams")
@@ -62,7 +72,7 @@ class ActivePlayer(SQLModel, table=True):
 
 class Season(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True, index=True)
-    start_date: datetime = Field(default_factory=datetime.now, nullable=False)
+    start_date: datetime = Field(default_factory=datetime.now, nullable=False, index=True)
     end_date: Optional[datetime] = Field(nullable=True)
 
     matches: List["Match"] = Relationship(back_populates="season")
@@ -90,3 +100,18 @@ class PlayerSeasonFinalElo(SQLModel, table=True):
     player_id: int = Field(foreign_key="player.id", index=True)
     season_id: int = Field(foreign_key="season.id", index=True)
     points: int
+
+
+class PlayerSeasonStats(SQLModel, table=True):
+    __table_args__ = (Index("ix_playerseasonstats_season_id_mode", "season_id", "mode"),)
+
+    player_id: int = Field(primary_key=True, foreign_key="player.id")
+    season_id: int = Field(primary_key=True, foreign_key="season.id")
+    mode: int = Field(primary_key=True)
+    wins: int = Field(default=0)
+    games: int = Field(default=0)
+
+
+class DataVersion(SQLModel, table=True):
+    name: str = Field(primary_key=True)
+    version: int = Field(default=0)
@@ -1,117 +1,217 @@
+import asyncio
 import json
 import logging
+import mmap
 import os
-from queue import Empty, Queue
-from threading import Thread
+from typing import Dict, Optional, Tuple
 
-import requests
+import aiohttp
 
 logger = logging.getLogger("champions")
 
 BASE_API_URL = "https://ddragon.leagueoflegends.com"
-CACHE_FILE = "./resources/champion_cache.json"
-
-
-def download_champion_image(version, name):
-    url = f"{BASE_API_URL}/cdn/{version}/img/champion/{name}.png"
-    response = requests.get(url)
-    return response.content
-
-
-def get_last_league_version():
-    url = f"{BASE_API_URL}/api/versions.json"
-
-    response = requests.get(url)
-
-    if response.status_code == 200:
-        return response.json()[0]
-    else:
-        logger.error("Error getting last league version: %s", response.text)
-        raise Exception("Error getting last league version")
-
+CACHE_DIR = "./resources/champions"
+CACHE_INDEX = os.path.join(CACHE_DIR, "index.json")
+CACHE_FORMAT = 1
+# Hex-encoded JSON cache of older versions, removed on the first save.
+LEGACY_CACHE_FILE = "./resources/champion_cache.json"
+
+DOWNLOAD_CONCURRENCY = 10
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=30)
+RETRY_DELAY = 1.0
+
+
+async def _fetch(
+    http_session: aiohttp.ClientSession, url: str, etag: Optional[str] = None
+) -> Tuple[int, bytes, Optional[str]]:
+    """
+    GET with retries on network errors, 429 and 5xx. With ``etag`` the request is conditional and a 304 comes back
+    with an empty body. Returns the status, the body and the ETag of the response.
+    """
+    headers = {"If-None-Match": etag} if etag else None
+
+    for attempt in range(DOWNLOAD_RETRIES):
+        try:
+            async with http_session.get(url, headers=headers, timeout=DOWNLOAD_TIMEOUT) as response:
+                if response.status == 304:
+                    return response.status, b"", response.headers.get("ETag", etag)
+
+                response.raise_for_status()
+                return response.status, await response.read(), response.headers.get("ETag")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            retryable = not isinstance(e, aiohttp.ClientResponseError) or e.status == 429 or e.status >= 500
+            if not retryable or attempt == DOWNLOAD_RETRIES - 1:
+                raise
+
+            logger.warning(f"Retrying {url} after error: {e}")
+            await asyncio.sleep(RETRY_DELAY * 2**attempt)
+
+
+async def get_last_league_version(http_session: aiohttp.ClientSession) -> str:
+    _, body, _ = await _fetch(http_session, f"{BASE_API_URL}/api/versions.json")
+    return json.loads(body)[0]
+
+
+async def download_champion_data(
+    http_session: aiohttp.ClientSession, version: str, previous: Dict[str, dict], downloaded: Dict[str, dict]
+) -> Dict[str, dict]:
+    """
+    Champions of ``version``, with their images fetched ``DOWNLOAD_CONCURRENCY`` at a time.
+
+    An image already in ``previous`` is requested conditionally on its ETag and reused on a 304, so a new version
+    only transfers the images that changed. Every champion that finishes goes into ``downloaded``: if the download
+    fails halfway, passing the same dict again resumes it from there.
+    """
+    _, body, _ = await _fetch(http_session, f"{BASE_API_URL}/cdn/{version}/data/pt_BR/champion.json")
+    champions = json.loads(body)["data"]
+    semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+
+    async def fetch_champion(champion: dict):
+        cached = previous.get(champion["key"])
+
+        async with semaphore:
+            status, image, etag = await _fetch(
+                http_session,
+                f"{BASE_API_URL}/cdn/{version}/img/champion/{champion['id']}.png",
+                cached.get("etag") if cached else None,
+            )
+
+        downloaded[champion["key"]] = {
+            "name": champion["name"],
+            "image": cached["image"] if status == 304 else image,
+            "id": champion["key"],
+            "etag": etag,
+        }
 
-def download_champion_data(version):
-    url = f"{BASE_API_URL}/cdn/{version}/data/pt_BR/champion.json"
+    pending = [champion for champion in champions.values() if champion["key"] not in downloaded]
+    logger.info(f"Downloading {len(pending)} of {len(champions)} champions of version {version}")
 
-    response = requests.get(url)
+    # Let every download finish before raising, so a retry only has to fetch the ones that failed.
+    results = await asyncio.gather(*(fetch_champion(champion) for champion in pending), return_exceptions=True)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        logger.error(f"{len(errors)} champion downloads failed, {len(downloaded)} kept for the next attempt")
+        raise errors[0]
 
-    logger.info("Downloading champions list")
-    if response.status_code == 200:
-        champions = response.json()["data"]
-        champions_data = {}
-        q = Queue()
+    logger.info("Download finished")
+    return {key: downloaded[key] for key in (champion["key"] for champion in champions.values())}
 
-        def __fetch_champion():
-            finished = False
-            while not finished:
-                try:
-                    champion_name = q.get(block=False)
-                    logger.info(f"Downloading champion {champion_name}")
-                    image = download_champion_image(version, champion_name)
-                    champions_data[champions[champion_name]["key"]] = {
-                        "name": champions[champion_name]["name"],
-                        "image": image,
-                        "id": champions[champion_name]["key"],
-                    }
-                    q.task_done()
-                except Empty:
-                    finished = True
 
-        for champion in champions:
-            q.put(champion)
+def load_cache() -> Tuple[Optional[str], Dict[str, dict]]:
+    """
+    Read the index and map its pack file: images come back as memoryviews over the mapping, so nothing is copied
+    or decoded until an image is actually used.
+    """
+    if not os.path.exists(CACHE_INDEX):
+        return None, {}
 
-        for i in range(10):
-            t = Thread(target=__fetch_champion, daemon=True)
-            t.start()
+    with open(CACHE_INDEX, "r") as f:
+        index = json.load(f)
 
-        q.join()
-        logger.info("Download finished")
+    if index.get("format") != CACHE_FORMAT:
+        return None, {}
 
-        return champions_data
+    with open(os.path.join(CACHE_DIR, index["pack"]), "rb") as f:
+        pack = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
 
-    else:
-        logger.error("Error getting champions list: %s", response.text)
-        raise Exception("Error getting champions list")
+    champions_data = {
+        _id: {
+            "name": d["name"],
+            "image": pack[d["offset"] : d["offset"] + d["length"]],
+            "id": d["id"],
+            "etag": d["etag"],
+        }
+        for _id, d in index["champions"].items()
+    }
+    return index["version"], champions_data
+
+
+def save_cache(version: str, champions_data: Dict[str, dict]):
+    """
+    Write the images of a version into one pack file and point the index at it, replacing the previous pack.
+
+    The pack gets a new name per version and the index is replaced last, so a crash at any point leaves a
+    consistent cache behind.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    previous_packs = set(os.listdir(CACHE_DIR)) - {os.path.basename(CACHE_INDEX)}
+
+    pack_name = f"{version}.pack"
+    champions_index = {}
+    offset = 0
+
+    with open(os.path.join(CACHE_DIR, f"{pack_name}.tmp"), "wb") as f:
+        for _id, d in champions_data.items():
+            f.write(d["image"])
+            champions_index[_id] = {
+                "name": d["name"],
+                "id": d["id"],
+                "etag": d["etag"],
+                "offset": offset,
+                "length": len(d["image"]),
+            }
+            offset += len(d["image"])
+    os.replace(os.path.join(CACHE_DIR, f"{pack_name}.tmp"), os.path.join(CACHE_DIR, pack_name))
+
+    with open(f"{CACHE_INDEX}.tmp", "w") as f:
+        json.dump({"format": CACHE_FORMAT, "version": version, "pack": pack_name, "champions": champions_index}, f)
+    os.replace(f"{CACHE_INDEX}.tmp", CACHE_INDEX)
+
+    stale = [os.path.join(CACHE_DIR, name) for name in previous_packs if name != pack_name]
+    if os.path.exists(LEGACY_CACHE_FILE):
+        stale.append(LEGACY_CACHE_FILE)
+
+    for path in stale:
+        try:
+            os.remove(path)
+        except OSError:
+            # Still mapped on platforms that lock mapped files; it goes on a later save.
+            pass
 
 
-def get_champions():
-    latest_version = get_last_league_version()
+class ImageDict(dict):
+    """
+    Champion data by id, loaded from the disk cache and kept up to date from Data Dragon with ``update_data``.
 
-    if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, "r") as f:
-            cache = json.load(f)
-            cached_version = cache.get("version")
+    Building it only reads the small index and maps the pack, without touching the network: names and ids are
+    there right away, and the bytes of an image are paged in from disk the first time it is used. With no cache
+    it starts empty until the first ``update_data``.
+    """
 
-            if cached_version == latest_version:
+    def __init__(self):
+        super().__init__()
+        self.version, champions_data = load_cache()
+        self.update(champions_data)
+
+        self._pending_version: Optional[str] = None
+        self._pending: Dict[str, dict] = {}
+        self._update_lock = asyncio.Lock()
+
+    async def update_data(self, http_session: aiohttp.ClientSession) -> bool:
+        """
+        Download the latest version if it is new, then swap it in. Returns whether the data changed.
+        """
+        async with self._update_lock:
+            latest_version = await get_last_league_version(http_session)
+            if latest_version == self.version:
                 logger.info("Using cached champions data.")
-                champions_data = {
-                    _id: {"name": d["name"], "image": bytes.fromhex(d["image"]), "id": d["id"]}
-                    for _id, d in cache["champions"].items()
-                }
-                return champions_data
-
-    logger.info(f"New version found: {latest_version}. Downloading new champion data...")
-    champions_data = download_champion_data(latest_version)
-
-    with open(CACHE_FILE, "w") as f:
-        cache_data = {
-            "version": latest_version,
-            "champions": {
-                _id: {"name": d["name"], "image": d["image"].hex(), "id": d["id"]} for _id, d in champions_data.items()
-            },
-        }
-        json.dump(cache_data, f, indent=4)
+                return False
 
-    return {
-        _id: {"name": d["name"], "image": bytes.fromhex(d["image"].hex()), "id": d["id"]}
-        for _id, d in champions_data.items()
-    }
+            logger.info(f"New version found: {latest_version}. Downloading new champion data...")
+            if self._pending_version != latest_version:
+                self._pending_version, self._pending = latest_version, {}
 
+            champions_data = await download_champion_data(http_session, latest_version, self, self._pending)
 
-class ImageDict(dict):
-    def __init__(self):
-        super().__init__()
-        self.update_data()
+            # Serve the new images from the pack just written rather than keeping the downloaded copies around.
+            await asyncio.to_thread(save_cache, latest_version, champions_data)
+            _, champions_data = await asyncio.to_thread(load_cache)
+
+            # No await between these lines, so commands running on the loop see either the old data or the new one.
+            self.clear()
+            self.update(champions_data)
+            self.version = latest_version
+            self._pending_version, self._pending = None, {}
 
-    def update_data(self):
-        self.update(get_champions())
+            return True
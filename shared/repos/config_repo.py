@@ -20,7 +20,7 @@ def remove_from_pool(session: Session, player_id: int):
 
 
 def get_pool_players(session: Session) -> List[Player]:
-    query = select(Player).join(ActivePlayer, Player.id == ActivePlayer.player_id)
+    query = select(Player).where(Player.id.in_(select(ActivePlayer.player_id)))
 
     return session.exec(query).all()
 
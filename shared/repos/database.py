@@ -1,14 +1,126 @@
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from shared.config import (
+    DATABASE_MAX_OVERFLOW,
+    DATABASE_POOL_PRE_PING,
+    DATABASE_POOL_RECYCLE,
+    DATABASE_POOL_SIZE,
+    DATABASE_URL,
+    SQLITE_BUSY_TIMEOUT,
+)
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def _is_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite"
+
+
+def _engine_options(url: URL) -> dict:
+    options = {"pool_pre_ping": DATABASE_POOL_PRE_PING}
+
+    # In-memory SQLite lives in a single connection, so it gets no connection pool to size.
+    if not _is_sqlite(url) or url.database not in (None, "", ":memory:"):
+        options.update(
+            pool_size=DATABASE_POOL_SIZE, max_overflow=DATABASE_MAX_OVERFLOW, pool_recycle=DATABASE_POOL_RECYCLE
+        )
+
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    WAL lets the bot and the API read while the other one writes, and busy_timeout makes a writer wait for the lock
+    instead of failing right away. With WAL, synchronous=NORMAL is still safe against corruption and skips an fsync
+    on every commit.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+    cursor.close()
+
+
+def create_db_engine(url: str = DATABASE_URL) -> Engine:
+    url = make_url(url)
+    db_engine = create_engine(url, **_engine_options(url))
+
+    if _is_sqlite(url):
+        event.listen(db_engine, "connect", _set_sqlite_pragmas)
 
-from bot.config import DATABASE_URL
+    return db_engine
 
-engine = create_engine(DATABASE_URL)
+
+def create_async_db_engine(url: str = DATABASE_URL) -> AsyncEngine:
+    url = make_url(url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver:
+        url = url.set(drivername=driver)
+
+    db_engine = create_async_engine(url, **_engine_options(url))
+
+    if _is_sqlite(url):
+        event.listen(db_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+    return db_engine
+
+
+engine = create_db_engine()
+
+# Built on first use, so processes that never touch it (the API, scripts) don't need the async drivers installed.
+_async_engine: Optional[AsyncEngine] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_db_engine()
+    return _async_engine
 
 
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
 
 
-def get_session():
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Unit of work: whatever is still pending is committed when the block ends, everything is rolled back if it raises,
+    and the connection always goes back to the pool.
+    """
     with Session(engine) as session:
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:
+    """
+    ``session_scope`` on the async engine, for code running on the event loop.
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+def get_session() -> Iterator[Session]:
+    """
+    ``session_scope`` as a FastAPI dependency.
+    """
+    with session_scope() as session:
         yield session
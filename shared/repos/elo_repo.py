@@ -1,21 +1,91 @@
-from sqlmodel import Session
+from datetime import datetime
+from typing import Dict, List, Tuple
 
-from shared.model.database import PlayerEloHistory, PlayerSeasonFinalElo
+from sqlalchemy import Select, false, insert, literal, null
+from sqlmodel import Session, and_, select, update
 
+from shared.model.database import Match, Player, PlayerEloHistory, PlayerSeasonFinalElo
 
-def create_history(session: Session, history: PlayerEloHistory) -> PlayerEloHistory:
-    history_db = PlayerEloHistory.model_validate(history)
 
-    session.add(history_db)
-    session.commit()
-    session.refresh(history_db)
-    return history_db
+def add_histories(session: Session, histories: List[PlayerEloHistory]) -> List[PlayerEloHistory]:
+    histories_db = [PlayerEloHistory.model_validate(history) for history in histories]
 
+    session.add_all(histories_db)
+    return histories_db
 
-def create_season_history(session: Session, season_elo: PlayerSeasonFinalElo) -> PlayerSeasonFinalElo:
-    season_elo_db = PlayerSeasonFinalElo.model_validate(season_elo)
 
-    session.add(season_elo_db)
-    session.commit()
-    session.refresh(season_elo_db)
-    return season_elo_db
+def add_season_final_elos(session: Session, season_id: int, player_ids: Select):
+    """
+    Stage the current points of every player in ``player_ids`` as their final elo of the season, in one statement.
+    """
+    session.exec(
+        insert(PlayerSeasonFinalElo).from_select(
+            ["player_id", "season_id", "points"],
+            select(Player.id, literal(season_id), Player.points).where(Player.id.in_(player_ids)),
+        )
+    )
+
+
+def add_reset_histories(session: Session, player_ids: Select, points: int):
+    """
+    Stage, in one statement, a history entry taking every player in ``player_ids`` from their current points to
+    ``points``. Must run before the points themselves are updated.
+    """
+    session.exec(
+        insert(PlayerEloHistory).from_select(
+            ["player_id", "match_id", "is_reverted", "created_at", "points_before", "points_after", "change"],
+            select(
+                Player.id,
+                null(),
+                false(),
+                literal(datetime.now()),
+                Player.points,
+                literal(points),
+                literal(points) - Player.points,
+            ).where(Player.id.in_(player_ids)),
+        )
+    )
+
+
+def get_active_history_by_matches(session: Session, match_ids: List[int]) -> List[PlayerEloHistory]:
+    return session.exec(
+        select(PlayerEloHistory).where(
+            and_(PlayerEloHistory.match_id.in_(match_ids), PlayerEloHistory.is_reverted.is_(False))
+        )
+    ).all()
+
+
+def get_active_changes_by_matches(session: Session, match_ids: List[int]) -> Dict[Tuple[int, int], int]:
+    query = select(PlayerEloHistory.match_id, PlayerEloHistory.player_id, PlayerEloHistory.change).where(
+        and_(PlayerEloHistory.match_id.in_(match_ids), PlayerEloHistory.is_reverted.is_(False))
+    )
+
+    return {(match_id, player_id): change for match_id, player_id, change in session.exec(query)}
+
+
+def mark_reverted(session: Session, history_ids: List[int]):
+    session.exec(update(PlayerEloHistory).where(PlayerEloHistory.id.in_(history_ids)).values(is_reverted=True))
+
+
+def get_active_history_from(session: Session, season_id: int, created_at: datetime) -> List[PlayerEloHistory]:
+    return session.exec(
+        select(PlayerEloHistory)
+        .join(Match)
+        .where(
+            and_(
+                Match.season_id == season_id,
+                Match.created_at >= created_at,
+                Match.result.is_not(None),
+                PlayerEloHistory.is_reverted.is_(False),
+            )
+        )
+    ).all()
+
+
+def get_season_final_elos(session: Session, season_id: int) -> List[Tuple[PlayerSeasonFinalElo, Player]]:
+    return session.exec(
+        select(PlayerSeasonFinalElo, Player)
+        .join(Player, Player.id == PlayerSeasonFinalElo.player_id)
+        .where(PlayerSeasonFinalElo.season_id == season_id)
+        .order_by(PlayerSeasonFinalElo.points.desc(), Player.id)
+    ).all()
@@ -1,44 +1,156 @@
-from typing import List
+from collections import defaultdict
+from datetime import datetime
+from itertools import combinations
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-from sqlmodel import Session, and_, select
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, and_, or_, select
 
-from shared.model.database import Match, Player, PlayerTeam, Team
+from shared.model.database import Match, Player, PlayerTeam, Team, TeamSide
+from shared.repos.writer import save
 
 
 def get_by_id(session: Session, match_id: int) -> Match:
     return session.exec(select(Match).where(Match.id == match_id)).first()
 
 
-def get_all_finished_by_player(session: Session, player_id: int, limit: int) -> List[Match]:
+class MatchHistoryRow(NamedTuple):
+    created_at: datetime
+    mode: int
+    side: TeamSide
+    result: TeamSide
+
+
+def get_history_by_player(session: Session, player_id: int, limit: int) -> List[MatchHistoryRow]:
+    """
+    Last finished matches of a player with the side they played on, in a single query.
+    """
     query = (
-        select(Match)
-        .join(Team)
-        .join(PlayerTeam)
-        .join(Player)
-        .where(and_(Player.id == player_id, Match.result.is_not(None)))
+        select(Match.created_at, Match.mode, Team.side, Match.result)
+        .join(Team, Team.match_id == Match.id)
+        .join(PlayerTeam, PlayerTeam.team_id == Team.id)
+        .where(and_(PlayerTeam.player_id == player_id, Match.result.is_not(None)))
         .order_by(Match.created_at.desc())
         .limit(limit)
     )
 
+    return [MatchHistoryRow(*row) for row in session.exec(query)]
+
+
+def get_finished_page_by_player(
+    session: Session, player_id: int, limit: int, before: Optional[int] = None
+) -> List[Match]:
+    """
+    Keyset page of the finished matches of a player, newest first, starting after the match ``before``.
+    """
+    query = (
+        select(Match)
+        .join(Team, Team.match_id == Match.id)
+        .join(PlayerTeam, PlayerTeam.team_id == Team.id)
+        .where(and_(PlayerTeam.player_id == player_id, Match.result.is_not(None)))
+    )
+
+    if before is not None:
+        cursor_created_at = select(Match.created_at).where(Match.id == before).scalar_subquery()
+        query = query.where(
+            or_(
+                Match.created_at < cursor_created_at,
+                and_(Match.created_at == cursor_created_at, Match.id < before),
+            )
+        )
+
+    return session.exec(query.order_by(Match.created_at.desc(), Match.id.desc()).limit(limit)).all()
+
+
+class LineupRow(NamedTuple):
+    match_id: int
+    team_id: int
+    side: TeamSide
+    team_rating: float
+    player_id: int
+    username: str
+    discord_id: Optional[str]
+
+
+def get_lineups(session: Session, match_ids: List[int]) -> List[LineupRow]:
+    """
+    Every (team, player) pair of the matches, in one query.
+    """
+    query = (
+        select(Team.match_id, Team.id, Team.side, Team.team_rating, Player.id, Player.username, Player.discord_id)
+        .join(PlayerTeam, PlayerTeam.team_id == Team.id)
+        .join(Player, Player.id == PlayerTeam.player_id)
+        .where(Team.match_id.in_(match_ids))
+        .order_by(Team.id, Player.id)
+    )
+
+    return [LineupRow(*row) for row in session.exec(query)]
+
+
+def get_recent_teammate_counts(session: Session, player_ids: List[int], limit: int) -> Dict[Tuple[int, int], int]:
+    recent_matches = select(Match.id).where(Match.result.is_not(None)).order_by(Match.created_at.desc()).limit(limit)
+
+    rows = session.exec(
+        select(PlayerTeam.team_id, PlayerTeam.player_id)
+        .join(Team)
+        .where(and_(Team.match_id.in_(recent_matches), PlayerTeam.player_id.in_(player_ids)))
+    ).all()
+
+    teams = defaultdict(list)
+    for team_id, player_id in rows:
+        teams[team_id].append(player_id)
+
+    counts = defaultdict(int)
+    for members in teams.values():
+        for pair in combinations(sorted(members), 2):
+            counts[pair] += 1
+
+    return dict(counts)
+
+
+def get_finished_in_range(session: Session, first_match_id: int, last_match_id: int) -> List[Match]:
+    query = (
+        select(Match)
+        .where(and_(Match.id.between(first_match_id, last_match_id), Match.result.is_not(None)))
+        .order_by(Match.created_at)
+    )
+
     return session.exec(query).all()
 
 
+def stream_finished_from(session: Session, season_id: int, created_at: datetime) -> Iterator[Match]:
+    query = (
+        select(Match)
+        .where(and_(Match.season_id == season_id, Match.created_at >= created_at, Match.result.is_not(None)))
+        .order_by(Match.created_at, Match.id)
+        .options(selectinload(Match.teams).selectinload(Team.players))
+        .execution_options(yield_per=100)
+    )
+
+    return iter(session.exec(query))
+
+
 def get_all(session: Session) -> List[Match]:
     return session.exec(select(Match)).all()
 
 
-def create(session: Session, match: Match) -> Match:
+def create(session: Session, match: Match, commit: bool = True) -> Match:
     match_db = Match.model_validate(match)
 
     session.add(match_db)
-    session.commit()
-    session.refresh(match_db)
+    save(session, commit)
     return match_db
 
 
-def update(session: Session, match: Match) -> Match:
+def update(session: Session, match: Match, commit: bool = True) -> Match:
     session.add(match)
-    session.commit()
-    session.refresh(match)
+    save(session, commit)
 
     return match
+
+
+def update_all(session: Session, matches: List[Match]) -> List[Match]:
+    session.add_all(matches)
+    session.commit()
+
+    return matches
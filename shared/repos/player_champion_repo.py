@@ -1,12 +1,62 @@
-from sqlmodel import Session
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
 
-from shared.model.database import PlayerMatchChampion
+from sqlalchemy import func
+from sqlmodel import Session, select
 
+from shared.model.database import Match, PlayerMatchChampion
+from shared.repos.writer import save
 
-def create_player_champion(session: Session, player_champion: PlayerMatchChampion) -> PlayerMatchChampion:
+
+def create_player_champion(
+    session: Session, player_champion: PlayerMatchChampion, commit: bool = True
+) -> PlayerMatchChampion:
     player_champion_db = PlayerMatchChampion.model_validate(player_champion)
 
     session.add(player_champion_db)
-    session.commit()
-    session.refresh(player_champion_db)
+    save(session, commit)
     return player_champion_db
+
+
+def get_champion_pool_sizes(session: Session, player_ids: List[int]) -> Dict[int, int]:
+    query = (
+        select(PlayerMatchChampion.player_id, func.count(func.distinct(PlayerMatchChampion.champion_id)))
+        .where(PlayerMatchChampion.player_id.in_(player_ids))
+        .group_by(PlayerMatchChampion.player_id)
+    )
+
+    return dict(session.exec(query).all())
+
+
+def get_recent_champions(session: Session, player_ids: List[int], limit: int) -> Dict[int, Set[str]]:
+    """
+    Champions each player had in their last ``limit`` finished matches.
+    """
+    recent = (
+        select(
+            PlayerMatchChampion.player_id,
+            PlayerMatchChampion.champion_id,
+            func.row_number()
+            .over(partition_by=PlayerMatchChampion.player_id, order_by=(Match.created_at.desc(), Match.id.desc()))
+            .label("recency"),
+        )
+        .join(Match, Match.id == PlayerMatchChampion.match_id)
+        .where(PlayerMatchChampion.player_id.in_(player_ids), Match.result.is_not(None))
+        .subquery("recent")
+    )
+
+    query = select(recent.c.player_id, recent.c.champion_id).where(recent.c.recency <= limit)
+
+    champions = defaultdict(set)
+    for player_id, champion_id in session.exec(query).all():
+        champions[player_id].add(champion_id)
+
+    return dict(champions)
+
+
+def get_champions_by_matches(session: Session, match_ids: List[int]) -> Dict[Tuple[int, int], str]:
+    query = select(PlayerMatchChampion.match_id, PlayerMatchChampion.player_id, PlayerMatchChampion.champion_id).where(
+        PlayerMatchChampion.match_id.in_(match_ids)
+    )
+
+    return {(match_id, player_id): champion_id for match_id, player_id, champion_id in session.exec(query)}
@@ -1,9 +1,11 @@
 from typing import List, Optional, Sequence, Tuple
 
-from sqlalchemy import func
-from sqlmodel import Session, and_, select
+from sqlalchemy import Select, func
+from sqlmodel import Session, and_, select, update
 
-from shared.model.database import Match, Player, PlayerEloHistory, PlayerTeam, Season, Team
+from shared.model.database import Match, Player, PlayerTeam, Season, Team
+from shared.repos import version_repo
+from shared.repos.writer import save
 
 
 def get_all_players(session) -> List[Player]:
@@ -26,34 +28,19 @@ def get_players_by_discord_ids(session: Session, discord_ids: List[str]) -> List
     return session.exec(select(Player).where(Player.discord_id.in_(discord_ids))).all()
 
 
-def get_all_players_ranked(session: Session) -> List[Player]:
+def get_all_players_ranked_with_games(session: Session) -> List[Tuple[Player, int]]:
     last_season_subquery = select(Season.id).order_by(Season.start_date.desc()).limit(1)
 
     statement = (
-        select(Player)
-        .distinct()
+        select(Player, func.count(Match.id))
         .join(PlayerTeam)
         .join(Team)
         .join(Match)
         .where(and_(Match.season_id.in_(last_season_subquery), Match.result.is_not(None)))
-        .order_by(Player.points.desc())
+        .group_by(Player.id)
     )
 
-    players = session.exec(statement).all()
-    return players
-
-
-def get_all_players_ranked_paginated(session: Session, limit: int, offset: int) -> Tuple[List[Player], int]:
-    base_query = select(Player).join(PlayerEloHistory).distinct()
-
-    count_statement = select(func.count(base_query.c.id))
-    total_players = session.exec(count_statement).one()
-
-    paginated_statement = base_query.order_by(Player.points.desc()).offset(offset).limit(limit)
-
-    players_on_page = session.exec(paginated_statement).all()
-
-    return players_on_page, total_players
+    return session.exec(statement).all()
 
 
 def get_all_players_by_match(session: Session, match_id: int) -> Sequence[str]:
@@ -65,18 +52,25 @@ def get_all_players_by_match(session: Session, match_id: int) -> Sequence[str]:
     ).all()
 
 
-def create_player(session: Session, player: Player) -> Player:
+def create_player(session: Session, player: Player, commit: bool = True) -> Player:
     player_db = Player.model_validate(player)
 
     session.add(player_db)
-    session.commit()
-    session.refresh(player_db)
+    version_repo.bump_version(session, version_repo.RESULTS)
+    save(session, commit)
     return player_db
 
 
-def update_player(session: Session, player: Player) -> Player:
+def update_player(session: Session, player: Player, commit: bool = True) -> Player:
+    """
+    Stage the changes to ``player`` with a bump of the results version, since the API serves its profile fields.
+    """
     session.add(player)
-    session.commit()
-    session.refresh(player)
+    version_repo.bump_version(session, version_repo.RESULTS)
+    save(session, commit)
 
     return player
+
+
+def reset_points(session: Session, player_ids: Select, points: int):
+    session.exec(update(Player).where(Player.id.in_(player_ids)).values(points=points))
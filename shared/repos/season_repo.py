@@ -3,13 +3,14 @@ from datetime import datetime
 from sqlmodel import Session, select
 
 from shared.model.database import Season
+from shared.repos.writer import save
 
 
 def get_last_season(session: Session) -> Season:
     return session.exec(select(Season).order_by(Season.start_date.desc())).first()
 
 
-def create_season(session: Session, season: Season) -> Season:
+def create_season(session: Session, season: Season, commit: bool = True) -> Season:
     season_db = Season.model_validate(season)
 
     last_season = get_last_season(session)
@@ -19,8 +20,7 @@ def create_season(session: Session, season: Season) -> Season:
         session.add(last_season)
 
     session.add(season_db)
-    session.commit()
-    session.refresh(season_db)
+    save(session, commit)
     return season_db
 
 
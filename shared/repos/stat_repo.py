@@ -1,34 +1,60 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Integer, func, select
+from sqlalchemy import Integer, Select, delete, func, insert, select
 from sqlmodel import Session
 
-from shared.model.database import Match, Player, PlayerTeam, Team
+from shared.model.database import Match, Player, PlayerSeasonStats, PlayerTeam, Team
 
 
-def get_players_stat(session: Session, mode: int = 0, season: int = 0) -> Dict[str, Any]:
+def _aggregate_matches_query():
     win_condition = Team.side == Match.result
 
-    query = (
+    return (
         select(
-            Player.id,
-            Player.discord_id,
+            PlayerTeam.player_id,
+            Match.season_id,
+            Match.mode,
             func.sum(func.cast(win_condition, Integer)).label("wins"),
             func.count(Match.id).label("games"),
         )
-        .join(PlayerTeam, Player.id == PlayerTeam.player_id)
         .join(Team, PlayerTeam.team_id == Team.id)
         .join(Match, Team.match_id == Match.id)
-        .where(Match.result.is_not(None))
+        .where(Match.result.is_not(None), Match.season_id.is_not(None))
+        .group_by(PlayerTeam.player_id, Match.season_id, Match.mode)
     )
 
+
+def season_players_query(season_id: int) -> Select:
+    """
+    Ids of the players with a finished match in the season, to be used as a subquery.
+    """
+    return (
+        select(PlayerSeasonStats.player_id)
+        .where(PlayerSeasonStats.season_id == season_id, PlayerSeasonStats.games > 0)
+        .distinct()
+    )
+
+
+def get_players_stat(
+    session: Session, mode: int = 0, season: int = 0, player_ids: Optional[List[int]] = None
+) -> Dict[str, Any]:
+    query = select(
+        Player.id,
+        Player.discord_id,
+        func.sum(PlayerSeasonStats.wins).label("wins"),
+        func.sum(PlayerSeasonStats.games).label("games"),
+    ).join(PlayerSeasonStats, Player.id == PlayerSeasonStats.player_id)
+
     if mode != 0:
-        query = query.where(Match.mode == mode)
+        query = query.where(PlayerSeasonStats.mode == mode)
 
     if season != 0:
-        query = query.where(Match.season_id == season)
+        query = query.where(PlayerSeasonStats.season_id == season)
+
+    if player_ids is not None:
+        query = query.where(PlayerSeasonStats.player_id.in_(player_ids))
 
-    query = query.group_by(Player.id, Player.discord_id)
+    query = query.group_by(Player.id, Player.discord_id).having(func.sum(PlayerSeasonStats.games) > 0)
 
     results = session.exec(query).all()
 
@@ -47,3 +73,64 @@ def get_players_stat(session: Session, mode: int = 0, season: int = 0) -> Dict[s
         }
 
     return stats
+
+
+def get_stats_by_player(session: Session, player_id: int) -> List[PlayerSeasonStats]:
+    return (
+        session.exec(
+            select(PlayerSeasonStats)
+            .where(PlayerSeasonStats.player_id == player_id, PlayerSeasonStats.games > 0)
+            .order_by(PlayerSeasonStats.season_id.desc(), PlayerSeasonStats.mode)
+        )
+        .scalars()
+        .all()
+    )
+
+
+def _apply_match_stats(session: Session, match_ids: List[int], sign: int):
+    rows = session.exec(_aggregate_matches_query().where(Match.id.in_(match_ids))).all()
+    if not rows:
+        return
+
+    existing = {
+        (stat.player_id, stat.season_id, stat.mode): stat
+        for stat in session.exec(
+            select(PlayerSeasonStats).where(
+                PlayerSeasonStats.player_id.in_({row.player_id for row in rows}),
+                PlayerSeasonStats.season_id.in_({row.season_id for row in rows}),
+            )
+        ).scalars()
+    }
+
+    for player_id, season_id, mode, wins, games in rows:
+        stat = existing.get((player_id, season_id, mode))
+        if stat is None:
+            stat = PlayerSeasonStats(player_id=player_id, season_id=season_id, mode=mode)
+            existing[(player_id, season_id, mode)] = stat
+
+        stat.wins += sign * (wins or 0)
+        stat.games += sign * games
+        session.add(stat)
+
+
+def add_match_stats(session: Session, match_ids: List[int]):
+    """
+    Stage the wins/games of finished matches, to be committed with the match result.
+    """
+    _apply_match_stats(session, match_ids, 1)
+
+
+def remove_match_stats(session: Session, match_ids: List[int]):
+    """
+    Stage the removal of finished matches from the stats. Must run while the matches still have a result.
+    """
+    _apply_match_stats(session, match_ids, -1)
+
+
+def rebuild_stats(session: Session):
+    session.exec(delete(PlayerSeasonStats))
+    session.exec(
+        insert(PlayerSeasonStats).from_select(
+            ["player_id", "season_id", "mode", "wins", "games"], _aggregate_matches_query()
+        )
+    )
@@ -0,0 +1,29 @@
+from sqlmodel import Session, select, update
+
+from shared.model.database import DataVersion
+
+# Bumped whenever match results or player points change: finalize, revert, replay and season reset.
+RESULTS = "results"
+
+
+def get_version(session: Session, name: str) -> int:
+    data_version = session.get(DataVersion, name)
+    return data_version.version if data_version else 0
+
+
+def bump_version(session: Session, name: str) -> int:
+    """
+    Stage an increment of the version, to be committed with the change it stands for, and return the new version.
+    """
+    result = session.exec(
+        update(DataVersion)
+        .where(DataVersion.name == name)
+        .values(version=DataVersion.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+    if not result.rowcount:
+        session.add(DataVersion(name=name, version=1))
+        return 1
+
+    return session.exec(select(DataVersion.version).where(DataVersion.name == name)).one()
@@ -0,0 +1,11 @@
+from sqlmodel import Session
+
+
+def save(session: Session, commit: bool = True):
+    """
+    Commit what the session has pending, or with ``commit=False`` only flush it, to be committed by the caller.
+    """
+    if commit:
+        session.commit()
+    else:
+        session.flush()
@@ -0,0 +1,20 @@
+import pytest
+
+from benchmarks.query_plans import QUERIES, capture_selects, full_scans, seeded_engine
+
+
+@pytest.fixture(scope="module")
+def scans_of():
+    engine = seeded_engine()
+    statements = capture_selects(engine)
+
+    yield lambda query, allowed_scans: full_scans(engine, statements, query, allowed_scans)
+
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", QUERIES)
+def test_query_does_not_scan_full_tables(scans_of, name):
+    query, allowed_scans = QUERIES[name]
+
+    assert scans_of(query, allowed_scans) == set()